@@ -1,81 +1,340 @@
+import os
 import sys
+import json
 import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from transposition_table import Transposition_Table
+from bulk_loader import loading_task_graph
+from run_stats import running_with_stats, timing, reading_option
+from checkpoint import Checkpointer, run_signature, CHECKPOINT_EVERY
 
-class TaskDetail:
-    def __init__(self, label, cost, dependency_list):
-        self.label = label
-        self.cost = cost
-        self.dependencies = set(dependency_list)
+def canonical_budgets(rows, wide=False):
+    # Students and days are both interchangeable here, so any row or column
+    # permutation of the budget matrix has the same number of completions.
+    # The sorted matrix is packed into bytes to keep memo keys small.
+    if not rows:
+        return b''
+    rows = sorted(zip(*sorted(zip(*sorted(rows)))))
+    cells = [v for row in rows for v in row]
+    return array('L', cells).tobytes() if wide else bytes(cells)
+
+class Subtree_Too_Large(Exception):
+    pass
 
 class Schedule_Optimizer:
-    def __init__(self, number_Of_students, capacity_per_day, horizon, task_map):
+    def __init__(self, number_Of_students, capacity_per_day, horizon, task_graph, up_to_relabeling=False,
+                 memo_table=None):
         self.student_count = number_Of_students
         self.daily_limit = capacity_per_day
         self.total_days = horizon
-        self.all_tasks = task_map
-      
-        self.remaining_budget = {
-            i: [capacity_per_day] * horizon for i in range(1, number_Of_students + 1)
-        }
+        self.all_tasks = task_graph
+        self.up_to_relabeling = up_to_relabeling
+
+        # The graph numbers tasks in label order, so the lowest ready bit is
+        # the task the search always branches on first.
+        self.task_labels = task_graph.labels
+        self.task_costs = task_graph.costs.tolist()
+        self.successors = [task_graph.successors(i).tolist() for i in range(len(task_graph))]
+        self.waiting_on = task_graph.waiting_counts().tolist()
+
+        self.all_done = (1 << len(self.task_labels)) - 1
+        self.done_mask = 0
+        self.ready_mask = 0
+        for i, waiting in enumerate(self.waiting_on):
+            if waiting == 0:
+                self.ready_mask |= 1 << i
+
+        # Student s (1-based) owns cells (s-1)*horizon .. s*horizon-1.
+        self.remaining_budget = [capacity_per_day] * (number_Of_students * horizon)
+        self.wide_budgets = capacity_per_day > 255
         
         self.assignments = []
-        self.done_tasks = set()
+        self.students_opened = 0
         self.solutions_found = 0
-        self.visited_states = set()
+        self.completion_counts = memo_table if memo_table is not None else Transposition_Table()
+        self.node_budget = None
+        self.stats = None  # Run_Stats when the run asked for them
+
+    def budget_row(self, s_idx):
+        start = (s_idx - 1) * self.total_days
+        return tuple(self.remaining_budget[start:start + self.total_days])
 
     def generating_state_key(self):
-        tasks_snapshot = tuple(sorted(list(self.done_tasks)))
-        budget_snapshot = tuple(tuple(self.remaining_budget[s]) for s in range(1, self.student_count + 1))
-        return (tasks_snapshot, budget_snapshot)
+        if self.up_to_relabeling:
+            # Students that already hold a task are told apart by it, unused
+            # ones are not, so only how many are still unused goes in the key.
+            last = self.students_opened
+        else:
+            last = self.student_count
+        days, budget = self.total_days, self.remaining_budget
+        rows = [tuple(budget[start:start + days]) for start in range(0, last * days, days)]
+        return (self.done_mask, canonical_budgets(rows, self.wide_budgets), self.student_count - last)
+
+    def grouping_students(self):
+        # One (student, multiplicity) pair per distinct budget row: students
+        # with equal rows lead to the same number of completions.
+        last = self.students_opened if self.up_to_relabeling else self.student_count
+        groups = {}
+        for s_idx in range(1, last + 1):
+            row = self.budget_row(s_idx)
+            if row in groups: groups[row][1] += 1
+            else: groups[row] = [s_idx, 1]
+
+        choices = [tuple(g) for g in groups.values()]
+        if self.up_to_relabeling and self.students_opened < self.student_count:
+            choices.append((self.students_opened + 1, 1))
+        return choices
+
+    def walking_students(self):
+        if self.up_to_relabeling:
+            return range(1, min(self.students_opened + 1, self.student_count) + 1)
+        return range(1, self.student_count + 1)
 
     def finding_executable_tasks(self):
         ready = []
-        for tid, t_obj in self.all_tasks.items():
-            if tid not in self.done_tasks:
-                if t_obj.dependencies.issubset(self.done_tasks):
-                    ready.append(tid)
-        ready.sort() 
+        mask = self.ready_mask
+        while mask:
+            low = mask & -mask
+            ready.append(self.task_labels[low.bit_length() - 1])
+            mask ^= low
         return ready
 
-    def executing_search(self):
-        if len(self.done_tasks) == len(self.all_tasks):
-            self.displaying_the_result()
+    def next_task(self):
+        mask = self.ready_mask
+        return (mask & -mask).bit_length() - 1 if mask else None
+
+    def placing_task(self, task, s_idx, d_idx):
+        self.remaining_budget[(s_idx - 1) * self.total_days + d_idx] -= self.task_costs[task]
+        bit = 1 << task
+        self.done_mask |= bit
+        self.ready_mask &= ~bit
+        for succ in self.successors[task]:
+            self.waiting_on[succ] -= 1
+            if self.waiting_on[succ] == 0:
+                self.ready_mask |= 1 << succ
+        self.assignments.append((task, s_idx, d_idx))
+        if s_idx > self.students_opened:
+            self.students_opened += 1
+            return True
+        return False
+
+    def removing_task(self, task, s_idx, d_idx, opened):
+        if opened:
+            self.students_opened -= 1
+        self.assignments.pop()
+        for succ in self.successors[task]:
+            if self.waiting_on[succ] == 0:
+                self.ready_mask &= ~(1 << succ)
+            self.waiting_on[succ] += 1
+        bit = 1 << task
+        self.ready_mask |= bit
+        self.done_mask &= ~bit
+        self.remaining_budget[(s_idx - 1) * self.total_days + d_idx] += self.task_costs[task]
+
+    def child_moves(self):
+        # Placements out of the current state, in the order the walk takes them.
+        target_task = self.next_task()
+        if target_task is None:
+            return []
+        cost = self.task_costs[target_task]
+        moves = []
+        for s_idx in self.walking_students():
+            base = (s_idx - 1) * self.total_days
+            for d_idx in range(self.total_days):
+                if self.remaining_budget[base + d_idx] >= cost:
+                    moves.append((target_task, s_idx, d_idx))
+        return moves
+
+    def replaying(self, prefix):
+        for task, s_idx, d_idx in prefix:
+            self.placing_task(task, s_idx, d_idx)
+
+    def opening_frame(self, stack, present_state):
+        # Pushes a frame [state key, total so far, moves, next move, move
+        # applied] for the current state, whose count is not known yet.
+        if self.node_budget is not None:
+            self.node_budget -= 1
+            if self.node_budget < 0:
+                raise Subtree_Too_Large()
+        if self.stats is not None:
+            self.stats.node(len(self.assignments))
+
+        moves = []
+        target_task = self.next_task()
+        if target_task is not None:
+            cost = self.task_costs[target_task]
+            days = self.total_days
+            budget = self.remaining_budget
+
+            for s_idx, multiplicity in self.grouping_students():
+                base = (s_idx - 1) * days
+                for d_idx in range(days):
+                    if budget[base + d_idx] >= cost:
+                        moves.append((target_task, s_idx, d_idx, multiplicity))
+
+        stack.append([present_state, 0, moves, 0, None])
+
+    def counting_completions(self, checkpoint=None, frames=None):
+        # Depth-first count on an explicit stack of frames, so the depth is
+        # not bound by Python's recursion limit. Budgets are restored after
+        # every child, which makes the moves listed on entry the same ones a
+        # recursive walk would try. With a checkpoint the stack is handed
+        # over whenever one is due; `frames` resumes from such a stack.
+        placing, removing, opening = self.placing_task, self.removing_task, self.opening_frame
+        all_done, memo, state_key = self.all_done, self.completion_counts, self.generating_state_key
+        if frames is not None:
+            stack = frames
+            for frame in stack[:-1]:
+                placing(*frame[4][:3])
+        else:
+            if self.done_mask == all_done:
+                return 1
+            present_state = state_key()
+            value = memo.get(present_state)
+            if value is not None:
+                return value
+            stack = []
+            opening(stack, present_state)
+
+        while stack:
+            frame = stack[-1]
+            if checkpoint is not None and checkpoint.due():
+                # The top frame was just opened: only the frames below it
+                # have a move applied
+                checkpoint.saving(stack)
+
+            # Children whose count is settled at once are folded in here;
+            # the first one that needs a search gets a frame of its own
+            moves, position, total = frame[2], frame[3], frame[1]
+            value = 0
+            while position < len(moves):
+                task, s_idx, d_idx, multiplicity = moves[position]
+                position += 1
+                opened = placing(task, s_idx, d_idx)
+                if self.done_mask == all_done:
+                    value = 1
+                else:
+                    present_state = state_key()
+                    value = memo.get(present_state)
+                    if value is None:
+                        frame[4] = (task, s_idx, d_idx, multiplicity, opened)
+                        break
+                removing(task, s_idx, d_idx, opened)
+                total += multiplicity * value
+            frame[1], frame[3] = total, position
+            if value is None:
+                opening(stack, present_state)
+                continue
+
+            # Every child is counted: close the frame and fold it into its parent
+            while True:
+                stack.pop()
+                memo.put(frame[0], frame[1], len(self.task_labels) - len(self.assignments))
+                if not stack:
+                    return frame[1]
+                value = frame[1]
+                frame = stack[-1]
+                task, s_idx, d_idx, multiplicity, opened = frame[4]
+                removing(task, s_idx, d_idx, opened)
+                frame[1] += multiplicity * value
+                if frame[3] < len(frame[2]):
+                    break
+        return 0
+
+    def walking_schedules(self, skipping):
+        # Lazy pass over the same tree, on an explicit stack of frames
+        # [moves, next move, found, move applied, state key]. States with a
+        # known count of zero are never entered, states whose whole count
+        # fits in the pending skip are jumped over, and subtrees that turn
+        # out empty are remembered.
+        stack = []
+        entering = True
+        found = None
+        try:
+            while True:
+                if entering:
+                    entering = False
+                    found = yield from self.entering_walk(stack, skipping)
+                if not stack:
+                    return found
+
+                frame = stack[-1]
+                if found is not None:
+                    task, s_idx, d_idx, opened = frame[3]
+                    self.removing_task(task, s_idx, d_idx, opened)
+                    frame[3] = None
+                    frame[2] = found or frame[2]
+                    found = None
+
+                if frame[1] < len(frame[0]):
+                    task, s_idx, d_idx = frame[0][frame[1]]
+                    frame[1] += 1
+                    opened = self.placing_task(task, s_idx, d_idx)
+                    frame[3] = (task, s_idx, d_idx, opened)
+                    entering = True
+                else:
+                    stack.pop()
+                    if not frame[2]:
+                        self.completion_counts.put(frame[4], 0, len(self.task_labels) - len(self.assignments))
+                    found = frame[2]
+        finally:
+            # Closed early: take back every placement still on the stack
+            for frame in reversed(stack):
+                if frame[3] is not None:
+                    self.removing_task(*frame[3])
+
+    def entering_walk(self, stack, skipping):
+        # Settles the state just reached (yielding it if it is a complete
+        # plan) and returns whether it holds a plan, or pushes a frame for
+        # it and returns None.
+        if self.done_mask == self.all_done:
+            if skipping[0]:
+                skipping[0] -= 1
+            else:
+                yield [(self.task_labels[t], s, d + 1) for t, s, d in self.assignments]
             return True
 
         present_state = self.generating_state_key()
-        if present_state in self.visited_states:
+        known = self.completion_counts.get(present_state)
+        if known == 0:
+            if self.stats is not None:
+                self.stats.count("walk:empty subtree")
             return False
-        self.visited_states.add(present_state)
+        if known is not None and known <= skipping[0]:
+            if self.stats is not None:
+                self.stats.count("walk:skipped subtree")
+            skipping[0] -= known
+            return True
 
-        available = self.finding_executable_tasks()
-        if not available:
-            return False
+        stack.append([self.child_moves(), 0, False, None, present_state])
+        return None
 
-        target_task = available[0]
-        task_info = self.all_tasks[target_task]
+    def generating_schedules(self, limit=None, skip=0):
+        # Yields one assignment list (task, student, day) at a time, with
+        # students and days both counted from 1 as they are printed. Closing
+        # the generator early puts the optimizer back in its starting state.
+        if limit is not None and limit <= 0:
+            return
+        produced = 0
+        for plan in self.walking_schedules([skip]):
+            yield plan
+            produced += 1
+            if limit is not None and produced >= limit:
+                return
+
+    def executing_search(self, limit=5, skip=0):
+        self.solutions_found = self.counting_completions()
+
+        for shown, plan in enumerate(self.generating_schedules(limit, skip), skip + 1):
+            self.displaying_the_result(shown, plan)
 
-        for s_idx in range(1, self.student_count + 1):
-            for d_idx in range(self.total_days):
-                if self.remaining_budget[s_idx][d_idx] >= task_info.cost:
-                
-                    self.remaining_budget[s_idx][d_idx] -= task_info.cost
-                    self.done_tasks.add(target_task)
-                    self.assignments.append((target_task, s_idx, d_idx))
-
-                    self.executing_search()
-                    self.assignments.pop()
-                    self.done_tasks.remove(target_task)
-                    self.remaining_budget[s_idx][d_idx] += task_info.cost
-        
         return self.solutions_found > 0
 
-    def displaying_the_result(self):
-        self.solutions_found += 1
-        if self.solutions_found > 5: return
-        
-        print(f"\n Alternative Schedule Plan {self.solutions_found} ---")
+    def displaying_the_result(self, plan_number, plan):
+        print(f"\n Alternative Schedule Plan {plan_number} ---")
         output = {}
-        for tid, sid, day in self.assignments:
+        for tid, sid, day in plan:
             if sid not in output: output[sid] = {}
             if day not in output[sid]: output[sid][day] = []
             output[sid][day].append(tid)
@@ -83,38 +342,238 @@ class Schedule_Optimizer:
         for s in sorted(output.keys()):
             print(f"Student {s}:")
             for d in sorted(output[s].keys()):
-                print(f"  Day {d+1}: {', '.join(output[s][d])}")
+                print(f"  Day {d}: {', '.join(output[s][d])}")
+
+# Parallel counting: the tree is cut a few placements below the root and each
+# cut-off subtree is counted in a worker process. Subtrees that blow through
+# their node budget come back split into their children, so idle workers
+# pick up pieces of the large ones instead of waiting on a single worker.
+# A split keeps what the aborted walk found: children already in the
+# worker's memo come back with their count, and the rest are sent out again
+# with twice the budget, so a deep subtree is not cut over and over.
+
+_worker_setup = None
+_worker_counts = None
+
+def starting_worker(setup, memo_settings):
+    global _worker_setup, _worker_counts
+    _worker_setup = setup
+    _worker_counts = making_memo(*memo_settings)
+
+def rebuilding_engine(prefix):
+    engine = Schedule_Optimizer(*_worker_setup)
+    engine.completion_counts = _worker_counts
+    engine.replaying(prefix)
+    return engine
+
+def counting_subtree(prefix, node_budget):
+    engine = rebuilding_engine(prefix)
+    engine.node_budget = node_budget
+    try:
+        return 'count', engine.counting_completions()
+    except Subtree_Too_Large:
+        engine = rebuilding_engine(prefix)
+        children = []
+        for move in engine.child_moves():
+            opened = engine.placing_task(*move)
+            key = engine.generating_state_key()
+            finished = engine.done_mask == engine.all_done
+            children.append((prefix + (move,), key, finished, None if finished else _worker_counts.get(key)))
+            engine.removing_task(*move, opened)
+        return 'split', children
+
+def listing_subtree(prefix, skip, limit):
+    engine = rebuilding_engine(prefix)
+    engine.counting_completions()
+    return list(engine.generating_schedules(limit, skip))
+
+def parallel_search(setup, workers, split_depth=None, limit=5, skip=0, node_budget=200000,
+                    memo_settings=(None, 'lru')):
+    root = Schedule_Optimizer(*setup)
+
+    # Expand level by level in walk order until there is enough work to share.
+    frontier = [((), root.generating_state_key(), root.done_mask == root.all_done)]
+    depth = 0
+    while frontier and (len(frontier) < 4 * workers if split_depth is None else depth < split_depth):
+        expanded = []
+        for prefix, key, finished in frontier:
+            if finished:
+                expanded.append((prefix, key, finished))
+                continue
+            engine = Schedule_Optimizer(*setup)
+            engine.replaying(prefix)
+            for move in engine.child_moves():
+                opened = engine.placing_task(*move)
+                expanded.append((prefix + (move,), engine.generating_state_key(), engine.done_mask == engine.all_done))
+                engine.removing_task(*move, opened)
+        if len(expanded) == len(frontier):
+            break
+        frontier = expanded
+        depth += 1
 
-def run_engine():
+    # Subtrees with the same canonical key have the same count, so each key
+    # is sent to the pool once.
+    counts = {}
+    children = {}
+    order = []
+    with ProcessPoolExecutor(workers, initializer=starting_worker, initargs=(setup, memo_settings)) as pool:
+        pending = {}
+
+        def scheduling(prefix, key, finished, budget, known=None):
+            if finished:
+                counts[key] = 1
+            elif known is not None:
+                counts[key] = known
+            elif key not in counts and key not in children and key not in queued:
+                queued.add(key)
+                pending[pool.submit(counting_subtree, prefix, budget)] = key, budget
+
+        queued = set()
+        for prefix, key, finished in frontier:
+            order.append((prefix, key))
+            scheduling(prefix, key, finished, node_budget)
+
+        while pending:
+            finished_futures, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished_futures:
+                key, budget = pending.pop(future)
+                status, value = future.result()
+                if status == 'count':
+                    counts[key] = value
+                else:
+                    children[key] = [child_key for _, child_key, _, _ in value]
+                    for prefix, child_key, finished, known in value:
+                        scheduling(prefix, child_key, finished, 2 * budget, known)
+
+        def totaling(key):
+            if key not in counts:
+                counts[key] = sum(totaling(child_key) for child_key in children[key])
+            return counts[key]
+
+        leaves = [(prefix, totaling(key)) for prefix, key in order]
+        total = sum(count for _, count in leaves)
+
+        # Only the subtrees holding plans skip+1 .. skip+limit are walked again.
+        jobs = []
+        offset = 0
+        wanted_end = skip + limit
+        for prefix, count in leaves:
+            if count and offset + count > skip and offset < wanted_end:
+                local_skip = max(skip - offset, 0)
+                local_limit = min(wanted_end - offset, count) - local_skip
+                jobs.append(pool.submit(listing_subtree, prefix, local_skip, local_limit))
+            offset += count
+            if offset >= wanted_end:
+                break
+        plans = [plan for job in jobs for plan in job.result()]
+
+    return total, plans
+
+def streaming_schedules(engine, target, limit, skip):
+    # One JSON object per line, written as the search finds them.
+    sink = open(target, 'w') if target else sys.stdout
+    try:
+        for number, plan in enumerate(engine.generating_schedules(limit, skip), skip + 1):
+            record = {"plan": number, "assignments": [list(assignment) for assignment in plan]}
+            sink.write(json.dumps(record) + "\n")
+            if number == skip + 1:
+                sink.flush()
+    except BrokenPipeError:
+        pass
+    finally:
+        if target: sink.close()
+
+def making_memo(megabytes, policy):
+    if megabytes is None:
+        return Transposition_Table(policy='lru')
+    return Transposition_Table.from_megabytes(megabytes, policy)
+
+def counting_with_checkpoints(engine, path, signature, every):
+    # The count, saved to `path` every `every` seconds and resumed from it
+    # when the file is there. A checkpoint holds the search stack and the
+    # memo table, so a resumed run carries on where the last save left it.
+    # The table saves whole keys, so the byte-packed budgets resume as they are.
+    checkpoint = Checkpointer(path, signature, every,
+                              lambda frames: {'frames': frames, 'memo': engine.completion_counts.snapshot()})
+    saved = checkpoint.loading()
+    frames = None
+    if saved is not None:
+        engine.completion_counts.restoring(saved['memo'])
+        frames = saved['frames']
+        print(f"Resuming from {path}")
+    total = engine.counting_completions(checkpoint, frames)
+    checkpoint.finishing()
+    return total
+
+def run_engine(stats=None):
     if len(sys.argv) < 3:
         print("Error: Missing arguments (input_file, max_days)")
         return
 
-    raw_tasks = {}
     try:
-        with open(sys.argv[1], 'r') as source:
-            for line in source:
-                bits = line.strip().split()
-                if not bits or bits[0].startswith('%'): continue
-                
-                header = bits[0]
-                if header == 'N': n_val = int(bits[1])
-                elif header == 'K': k_val = int(bits[1])
-                elif header == 'A':
-                    name = bits[1]
-                    weight = int(bits[2])
-                    deps = [d for d in bits[3:] if d != '0']
-                    raw_tasks[name] = TaskDetail(name, weight, deps)
+        with timing(stats, 'load'):
+            headers, raw_tasks = loading_task_graph(sys.argv[1])
+        n_val, k_val = headers['N'], headers['K']
     except Exception as e:
         print(f"File Error: {e}")
         return
 
     window = int(sys.argv[2])
-    engine = Schedule_Optimizer(n_val, k_val, window, raw_tasks)
+    up_to_relabeling = '--up-to-relabeling' in sys.argv
+    skip = int(reading_option('--skip', 0))
+    memo_mb = reading_option('--memo-mb', None)
+    memo_settings = (None if memo_mb is None else float(memo_mb), reading_option('--memo-policy', 'lru'))
+    checkpoint_path = reading_option('--checkpoint', None)
+    engine = Schedule_Optimizer(n_val, k_val, window, raw_tasks, up_to_relabeling, making_memo(*memo_settings))
+    engine.stats = stats
+    if stats is not None:
+        stats.table('completion_counts', engine.completion_counts)
+
+    if '--jsonl' in sys.argv:
+        limit = reading_option('--limit', None)
+        with timing(stats, 'stream'):
+            streaming_schedules(engine, reading_option('--jsonl', None),
+                                None if limit is None else int(limit), skip)
+        return
 
     print("Initializing Search Engine...")
-    engine.executing_search()
-    print(f"\nSearch concluded. Found {engine.solutions_found} valid configurations.")
+    # More processes than CPUs only adds process start-up and re-split work
+    workers = min(int(reading_option('--workers', 1)), os.cpu_count() or 1)
+    if workers > 1:
+        split_depth = reading_option('--split-depth', None)
+        setup = (n_val, k_val, window, raw_tasks, up_to_relabeling)
+        # Nodes are expanded in the workers; only the phase time is kept here
+        with timing(stats, 'parallel search'):
+            engine.solutions_found, plans = parallel_search(
+                setup, workers, None if split_depth is None else int(split_depth),
+                int(reading_option('--limit', 5)), skip, memo_settings=memo_settings)
+        for shown, plan in enumerate(plans, skip + 1):
+            engine.displaying_the_result(shown, plan)
+    else:
+        with timing(stats, 'count'):
+            if checkpoint_path is None:
+                engine.solutions_found = engine.counting_completions()
+            else:
+                signature = run_signature(sys.argv[1], n_val, k_val, window, up_to_relabeling, memo_settings)
+                try:
+                    engine.solutions_found = counting_with_checkpoints(
+                        engine, checkpoint_path, signature,
+                        float(reading_option('--checkpoint-every', CHECKPOINT_EVERY)))
+                except ValueError as e:
+                    print(f"Checkpoint Error: {e}")
+                    return
+        with timing(stats, 'list'):
+            for shown, plan in enumerate(engine.generating_schedules(int(reading_option('--limit', 5)), skip),
+                                         skip + 1):
+                engine.displaying_the_result(shown, plan)
+    if stats is not None:
+        stats.extra['solutions'] = engine.solutions_found
+    if up_to_relabeling:
+        print(f"\nSearch concluded. Found {engine.solutions_found} valid configurations (up to student relabeling).")
+    else:
+        print(f"\nSearch concluded. Found {engine.solutions_found} valid configurations.")
+    if '--memo-stats' in sys.argv:
+        print("Memo:", ", ".join(f"{name}={value}" for name, value in engine.completion_counts.stats().items()))
 
 if __name__ == "__main__":
-    run_engine()
\ No newline at end of file
+    running_with_stats('assg01', run_engine)
\ No newline at end of file
@@ -1,115 +1,735 @@
+import os
 import sys
-from copy import deepcopy
-
-class Task_Detail:
-    def __init__(self, labeling, price , dependencylist):
-        self.labeling = labeling
-        self.price = price
-        self.dependencies = set(dependencylist)
+import json
+import hashlib
+from transposition_table import Transposition_Table
+from bulk_loader import loading_task_graph
+from run_stats import running_with_stats, timing, reading_option, missing_values
+from checkpoint import Checkpointer, run_signature, CHECKPOINT_EVERY
 
 def loading_tasks(file):
-    tasks = {}
-    with open(file) as f:
-        for line in f:
-            parts = line.strip().split()
-            if not parts or parts[0].startswith('%'):
-                continue
-            if parts[0] == 'A':
-                tid = parts[1]
-                price = int(parts[2])
-                deps = [x for x in parts[3:] if x != '0']
-                tasks[tid] = Task_Detail(tid, price, deps)
-    return tasks
+    return loading_task_graph(file)[1]
 
 class Schedule_Optimizer:
-    def __init__(self, N, K, days, tasks, nextday=False):
+    def __init__(self, N, K, days, tasks, nextday=False, dead_states=None, wider_days=(), stats=None):
         self.N = N                      
         self.K = K                     
         self.days = days
         self.tasks = tasks
         self.nextday = nextday
 
-        self.remaining = {s: [K]*days for s in range(N)}
-        self.done = set()
-        self.finish_day = {}          
-        self.memo = set()
+        # Dense task ids in label order; done/ready sets are int bitmasks and
+        # every task keeps a count of dependencies that are not done yet.
+        self.labels = tasks.labels
+        self.prices = tasks.costs.tolist()
+        self.preds = [tasks.predecessors(i).tolist() for i in range(len(tasks))]
+        self.succs = [tasks.successors(i).tolist() for i in range(len(tasks))]
+        self.waiting = tasks.waiting_counts().tolist()
+
+        self.all_done = (1 << len(self.labels)) - 1
+        self.done = 0
+        self.ready = 0
+        for i, w in enumerate(self.waiting):
+            if w == 0:
+                self.ready |= 1 << i
+
+        # Student s owns cells s*days .. (s+1)*days-1.
+        self.remaining = [K] * (N * days)
+        self.finish_day = [-1] * len(self.labels)
+        self.release_day = [0] * len(self.labels)
+
+        # dead_states holds states proven infeasible, tagged with the probe
+        # they failed in, so one table can serve many probes. A state that
+        # fails with more days also fails with fewer, so the longer horizons
+        # in wider_days are checked too, padded with full days.
+        self.memo = dead_states if dead_states is not None else Transposition_Table()
+        self.tag = (N, K, nextday, days)
+        self.wider = [(d - days, (N, K, nextday, d)) for d in wider_days if d > days]
+        self.stats = stats  # Run_Stats when the run asked for them
+
+    def rows(self):
+        d = self.days
+        return [tuple(self.remaining[s*d:(s+1)*d]) for s in range(self.N)]
         
     def state_key(self):
-        return (tuple(sorted(self.done)),
-                tuple(tuple(self.remaining[s]) for s in range(self.N)))
+        # Students are interchangeable, so their rows are kept as a sorted
+        # multiset. Without the sharing delay days are interchangeable too.
+        rows = sorted(self.rows())
+        if not self.nextday:
+            return (self.done, (), tuple(sorted(zip(*sorted(zip(*rows))))))
+        # With it, the finish days of done tasks that still hold back an
+        # undone successor decide when that successor may start.
+        finishes = tuple(self.finish_day[t] for t in range(len(self.labels))
+                         if self.done >> t & 1 and any(not self.done >> u & 1 for u in self.succs[t]))
+        return (self.done, finishes, tuple(rows))
+
+    def tasks_left(self):
+        return len(self.labels) - bin(self.done).count('1')
+
+    def distinct_students(self):
+        picks, seen = [], set()
+        for s, row in enumerate(self.rows()):
+            if row not in seen:
+                seen.add(row)
+                picks.append(s)
+        return picks
+
+    def distinct_days(self):
+        if self.nextday:
+            return range(self.days)
+        picks, seen = [], set()
+        for day in range(self.days):
+            column = tuple(self.remaining[day::self.days])
+            if column not in seen:
+                seen.add(column)
+                picks.append(day)
+        return picks
         
     def available_tasks(self, day):
         ready = []
-        for t in self.tasks:
-            if t not in self.done and self.deps_satisfied(t, day):
+        mask = self.ready
+        while mask:
+            low = mask & -mask
+            t = low.bit_length() - 1
+            if not self.nextday or self.release_day[t] <= day:
                 ready.append(t)
-        return sorted(ready)
-    
+            mask ^= low
+        return ready
 
-    def deps_satisfied(self, task, day):
-        for dep in self.tasks[task].dependencies:
-            if dep not in self.done:
-                return False
-            if self.nextday:
-                if self.finish_day[dep] >= day:
-                    return False
-        return True
+    def assign(self, task, cell, day):
+        self.remaining[cell] -= self.prices[task]
+        bit = 1 << task
+        self.done |= bit
+        self.ready &= ~bit
+        self.finish_day[task] = day
+        for succ in self.succs[task]:
+            self.waiting[succ] -= 1
+            if self.waiting[succ] == 0:
+                self.ready |= 1 << succ
+                if self.nextday:
+                    self.release_day[succ] = max(self.finish_day[p] for p in self.preds[succ]) + 1
+
+    def undo(self, task, cell):
+        for succ in self.succs[task]:
+            if self.waiting[succ] == 0:
+                self.ready &= ~(1 << succ)
+            self.waiting[succ] += 1
+        self.finish_day[task] = -1
+        bit = 1 << task
+        self.ready |= bit
+        self.done &= ~bit
+        self.remaining[cell] += self.prices[task]
+
+    def known_dead(self, key):
+        if (self.tag, key) in self.memo:
+            return True
+        rows = key[-1]
+        for extra, tag in self.wider:
+            padding = (self.K,) * extra
+            if (tag, key[:-1] + (tuple(row + padding for row in rows),)) in self.memo:
+                return True
+        return False
 
+    def marking_dead(self, key):
+        self.memo.add((self.tag, key), self.tasks_left())
 
-    def search(self):
-        if len(self.done) == len(self.tasks):
+    def opening(self):
+        # Enters the current state: True or False when it is settled at once,
+        # otherwise (state key, moves) with the moves in the order the
+        # search tries them.
+        if self.done == self.all_done:
             return True
 
         key = self.state_key()
-        if key in self.memo:
+        if self.known_dead(key):
+            if self.stats is not None:
+                self.stats.count("prune:dead state")
             return False
-        self.memo.add(key)
+        if self.stats is not None:
+            self.stats.node(self.tasks_left())
 
-        for day in range(self.days):
-            tasks_today = self.available_tasks(day)
-            for task in tasks_today:
-                price = self.tasks[task].price
+        moves = []
+        students = self.distinct_students()
+        for day in self.distinct_days():
+            for task in self.available_tasks(day):
+                price = self.prices[task]
+                for s in students:
+                    cell = s * self.days + day
+                    if self.remaining[cell] >= price:
+                        moves.append((task, cell, day))
+        return key, moves
+
+    def applying(self, move):
+        self.assign(*move)
 
-                for s in range(self.N):
-                    if self.remaining[s][day] >= price:
+    def retracting(self, move):
+        self.undo(move[0], move[1])
 
-                        self.remaining[s][day] -= price
-                        self.done.add(task)
-                        self.finish_day[task] = day
+    def search(self, checkpoint=None, frames=None):
+        # Depth-first on an explicit stack of [state key, moves, next move]
+        # frames, so deep task sets do not hit the recursion limit. Every
+        # frame below the top has its last tried move applied. On success the
+        # schedule is left in place. With a checkpoint the stack is handed
+        # over whenever one is due; `frames` resumes from such a stack.
+        opening, applying, retracting = self.opening, self.applying, self.retracting
+        if frames is not None:
+            stack = frames
+            for frame in stack[:-1]:
+                applying(frame[1][frame[2] - 1])
+        else:
+            opened = opening()
+            if opened is True or opened is False:
+                return opened
+            stack = [[opened[0], opened[1], 0]]
 
-                        if self.search():
-                            return True
+        while stack:
+            frame = stack[-1]
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.saving(stack)
+
+            # Children that are settled at once are tried in a row; the first
+            # one that needs a search gets a frame of its own
+            moves, position = frame[1], frame[2]
+            opened = False
+            while position < len(moves):
+                move = moves[position]
+                position += 1
+                applying(move)
+                opened = opening()
+                if opened is True:
+                    return True
+                if opened is not False:
+                    break
+                retracting(move)
+            frame[2] = position
+            if opened is not False:
+                stack.append([opened[0], opened[1], 0])
+                continue
 
-                        self.remaining[s][day] += price
-                        self.done.remove(task)
-                        del self.finish_day[task]
+            stack.pop()
+            self.marking_dead(frame[0])
+            if stack:
+                parent = stack[-1]
+                retracting(parent[1][parent[2] - 1])
         return False
 
-def earliest_completion(tasks, N, K, nextday):
-    for day in range(1, 50): 
-        engine = Schedule_Optimizer(N, K, day, tasks, nextday)
-        if engine.search():
-            return day
-    return -1
+class Branch_Bound_Solver(Schedule_Optimizer):
+    # Same question as Schedule_Optimizer.search, but every schedule is built
+    # in one canonical order: tasks are placed one by one in a fixed order,
+    # each choosing a (day, student). Before a node is expanded it is
+    # checked against capacity and critical-path bounds.
+    def __init__(self, N, K, days, tasks, nextday=False, dead_states=None, wider_days=(), stats=None):
+        super().__init__(N, K, days, tasks, nextday, dead_states, wider_days, stats)
+
+        # The graph's Kahn order, lowest label first among ready tasks. Only
+        # --nextday needs a task's dependencies placed before it; otherwise
+        # the most expensive tasks go first, as in first-fit decreasing, so
+        # the capacity bounds bite near the root and the cheap tasks left
+        # at the bottom fill the gaps.
+        order = tasks.order.tolist()
+        if not nextday:
+            order.sort(key=lambda t: -self.prices[t])
+        self.complete = tasks.complete
+        self.order = order
+        position = {t: i for i, t in enumerate(order)}
+
+        self.costs = [self.prices[t] for t in order]
+        self.pred_slots = [[position[p] for p in self.preds[t]] for t in order]
+
+        # tail[i]: tasks on the longest chain starting at slot i, itself included.
+        self.tail = [tasks.tails[t] for t in order]
+
+        # Suffix figures for the remaining tasks from slot i on.
+        # need_left[i]: (a, total cost of the remaining tasks costing a or
+        # more) for each distinct remaining cost a, cheapest first.
+        n = len(order)
+        self.need_left = [[] for _ in range(n + 1)]
+        self.max_left = [0] * (n + 1)
+        self.big_left = [0] * (n + 1)
+        self.big_min = [K + 1] * (n + 1)
+        per_cost = {}
+        for i in range(n - 1, -1, -1):
+            c = self.costs[i]
+            per_cost[c] = per_cost.get(c, 0) + c
+            need = 0
+            for a in sorted(per_cost, reverse=True):
+                need += per_cost[a]
+                self.need_left[i].append((a, need))
+            self.need_left[i].reverse()
+            self.max_left[i] = max(self.max_left[i + 1], c)
+            self.big_left[i] = self.big_left[i + 1] + (2 * c > K)
+            self.big_min[i] = min(self.big_min[i + 1], c) if 2 * c > K else self.big_min[i + 1]
+
+        # Under --nextday the finish days of placed tasks that still have
+        # unplaced successors are part of the state.
+        self.frontier = [[] for _ in range(n + 1)]
+        if nextday:
+            for j, t in enumerate(order):
+                last = max((position[succ] for succ in self.succs[t]), default=j)
+                for i in range(j + 1, last + 1):
+                    self.frontier[i].append(j)
+
+        self.slot_day = [-1] * n
+        self.placed = 0
+
+    def state_key(self):
+        rows = sorted(self.rows())
+        if not self.nextday:
+            rows = sorted(zip(*sorted(zip(*rows))))
+        finishes = tuple(self.slot_day[j] for j in self.frontier[self.placed])
+        return (self.placed, finishes, tuple(rows))
+
+    def tasks_left(self):
+        return len(self.order) - self.placed
+
+    def pruned(self):
+        # Name of the bound that rules this node out, or None.
+        i = self.placed
+        cells = self.remaining
+        # Cells too small for any remaining task are wasted capacity, and
+        # the same holds for every cost a: the tasks costing a or more only
+        # fit in cells with at least a left. With the dearest tasks placed
+        # first this catches a packing that leaves the gaps too small.
+        for smallest, need in self.need_left[i]:
+            if sum(r for r in cells if r >= smallest) < need:
+                return "capacity"
+        if max(cells) < self.max_left[i]:
+            return "largest task"
+        # Two tasks costing more than K/2 never share a student-day, so each
+        # one needs its own cell with room for it.
+        big = self.big_left[i]
+        if big and sum(1 for r in cells if r >= self.big_min[i]) < big:
+            return "big tasks"
+        return None
+
+    def opening(self):
+        i = self.placed
+        if i == len(self.order):
+            return self.complete
+        if not self.complete:
+            return False
+        cause = self.pruned()
+        if cause:
+            if self.stats is not None:
+                self.stats.count("prune:" + cause)
+            return False
+
+        key = self.state_key()
+        if self.known_dead(key):
+            if self.stats is not None:
+                self.stats.count("prune:dead state")
+            return False
+        if self.stats is not None:
+            self.stats.node(i)
+
+        cost = self.costs[i]
+        if not self.nextday:
+            # Nothing then ties a task to a day or a student, so cells with
+            # the same room left are interchangeable: one move per distinct
+            # room, tightest first (best fit).
+            moves, seen = [], set()
+            for cell in sorted(range(len(self.remaining)), key=self.remaining.__getitem__):
+                room = self.remaining[cell]
+                if room >= cost and room not in seen:
+                    seen.add(room)
+                    moves.append((cell, cell % self.days))
+            return key, moves
+
+        first = max((self.slot_day[p] + 1 for p in self.pred_slots[i]), default=0)
+        # The chain hanging off this task needs one day per link.
+        day_choices = range(first, self.days - self.tail[i] + 1)
+        moves = []
+        students = self.distinct_students()
+        for day in day_choices:
+            for s in students:
+                cell = s * self.days + day
+                if self.remaining[cell] >= cost:
+                    moves.append((cell, day))
+        return key, moves
+
+    def applying(self, move):
+        cell, day = move
+        self.remaining[cell] -= self.costs[self.placed]
+        self.slot_day[self.placed] = day
+        self.placed += 1
 
-def minimum_subscription(tasks, N, deadline, nextday):
-    low, high = 1, 50
+    def retracting(self, move):
+        self.placed -= 1
+        self.slot_day[self.placed] = -1
+        self.remaining[move[0]] += self.costs[self.placed]
+
+# Caps that keep Day_Layer_Solver polynomial on wide layers: past them it
+# keeps the first packings / fullest done-sets and only gives an upper bound.
+MAX_DAILY_PACKINGS = 256
+MAX_LAYER_STATES = 2048
+
+class Day_Layer_Solver:
+    # Engine for the next-day sharing rule only. A task may start on day d
+    # once all its dependencies finished before d, so what is ready on day d
+    # depends only on the set done before it. Each day is then one packing
+    # of ready tasks into N students with K prompts, and the schedule is a
+    # path through done-sets, one layer per day.
+    #
+    # Finishing more tasks on a day never hurts the days after it, so only
+    # maximal daily packings are followed and a done-set that is a subset of
+    # another one in the same layer is dropped. A greedy run gives an upper
+    # bound first; layers then only keep done-sets whose lower bound on the
+    # days still needed can beat it.
+    def __init__(self, N, K, tasks, stats=None):
+        self.N = N
+        self.K = K
+        self.stats = stats
+        self.labels = tasks.labels
+        self.prices = tasks.costs.tolist()
+        self.pred_mask, self.blocked = tasks.predecessor_masks()
+        self.all_done = (1 << len(self.labels)) - 1
+        self.packings = {}
+        # Set once a day had more packings or done-sets than the caps: the
+        # days found are then a real schedule but not proven optimal.
+        self.truncated = False
+
+        # tail[t]: days needed by the longest chain starting at t.
+        self.tail = tasks.tails.tolist()
+
+    def ready_tasks(self, done):
+        ready = 0
+        for t, preds in enumerate(self.pred_mask):
+            if not done >> t & 1 and preds & done == preds:
+                ready |= 1 << t
+        return ready & ~self.blocked
+
+    def daily_packings(self, ready):
+        if ready in self.packings:
+            return self.packings[ready]
+
+        items = [t for t in range(len(self.labels)) if ready >> t & 1]
+        items.sort(key=lambda t: -self.prices[t])
+        left = [0] * (len(items) + 1)
+        for i in range(len(items) - 1, -1, -1):
+            left[i] = left[i + 1] + self.prices[items[i]]
+        found = set()
+
+        # The recursion over (task, bin) ran one frame per ready task, which
+        # a wide layer overflows; frames are (item, packed, cheapest skipped,
+        # loads) and are pushed so they come off in the same order.
+        stack = [(0, 0, None, (0,) * self.N)]
+        while stack:
+            i, mask, cheapest_skipped, loads = stack.pop()
+            # Every bin must end up too full for the cheapest skipped task,
+            # otherwise it could still go in and the packing is not maximal.
+            # Cut the branch once the tasks left cannot fill that gap.
+            if cheapest_skipped is not None:
+                floor = self.K - cheapest_skipped + 1
+                if sum(max(0, floor - load) for load in loads) > left[i]:
+                    continue
+            if i == len(items):
+                found.add(mask)
+                if len(found) >= MAX_DAILY_PACKINGS:
+                    self.truncated = True
+                    break
+                continue
+            t = items[i]
+            price = self.prices[t]
+            stack.append((i + 1, mask, price, loads))
+            tried = set()
+            placed = []
+            for b in range(self.N):
+                if loads[b] + price <= self.K and loads[b] not in tried:
+                    tried.add(loads[b])
+                    placed.append((i + 1, mask | 1 << t, cheapest_skipped,
+                                   loads[:b] + (loads[b] + price,) + loads[b + 1:]))
+            stack.extend(reversed(placed))
+
+        result = keeping_maximal(found)
+        self.packings[ready] = result
+        return result
+
+    def days_needed(self, done):
+        cost = chain = big = 0
+        for t, price in enumerate(self.prices):
+            if not done >> t & 1:
+                cost += price
+                chain = max(chain, self.tail[t])
+                big += 2 * price > self.K
+        per_day = self.N * self.K
+        return max(-(-cost // per_day), chain, -(-big // self.N))
+
+    def greedy_days(self):
+        # Longest chain first, then most expensive, first fit into students.
+        done = 0
+        day = 0
+        while done != self.all_done:
+            ready = self.ready_tasks(done)
+            order = sorted((t for t in range(len(self.labels)) if ready >> t & 1),
+                           key=lambda t: (-self.tail[t], -self.prices[t]))
+            loads = [0] * self.N
+            for t in order:
+                for b in range(self.N):
+                    if loads[b] + self.prices[t] <= self.K:
+                        loads[b] += self.prices[t]
+                        done |= 1 << t
+                        break
+            if not any(loads):
+                return -1
+            day += 1
+        return day
+
+    def earliest_days(self):
+        if any(p > self.K for p in self.prices):
+            return -1
+        best = self.greedy_days()
+        if best == -1:
+            return -1
+
+        if self.days_needed(0) >= best:
+            return best
+
+        # Look for anything finishing before the greedy schedule does.
+        target = best - 1
+        layer = [0]
+        day = 0
+        while layer and self.all_done not in layer:
+            day += 1
+            following = set()
+            for done in layer:
+                if self.stats is not None:
+                    self.stats.node(day)
+                for packed in self.daily_packings(self.ready_tasks(done)):
+                    after = done | packed
+                    if day + self.days_needed(after) <= target:
+                        following.add(after)
+                    elif self.stats is not None:
+                        self.stats.count("prune:days bound")
+            layer = keeping_maximal(following)
+            if self.stats is not None:
+                self.stats.count("prune:dominated day", len(following) - len(layer))
+            if len(layer) > MAX_LAYER_STATES:
+                # Most tasks done first, as keeping_maximal sorts them.
+                layer = layer[:MAX_LAYER_STATES]
+                self.truncated = True
+        return day if layer else best
+
+def keeping_maximal(masks):
+    kept = []
+    for mask in sorted(masks, key=lambda m: -bin(m).count('1')):
+        if all(mask | other != other for other in kept):
+            kept.append(mask)
+    return kept
+
+def lower_bound_days(tasks, N, K, nextday):
+    # -1 when no horizon can work, otherwise a day count no schedule beats.
+    longest = tasks.longest_chain()
+    if longest is None or max(tasks.costs, default=0) > K:
+        return -1
+    total = sum(tasks.costs)
+    bound = max(1, -(-total // (N * K)))
+    if nextday:
+        bound = max(bound, longest)
+    return bound
+
+class Feasibility_Oracle:
+    # Answers "can N students with K prompts finish in `days` days?" for one
+    # task set. Feasibility only grows with K and with days, so every cached
+    # answer also settles the points it dominates: a yes at (K, d) covers
+    # all K' >= K, d' >= d and a no covers all K' <= K, d' <= d. Only the
+    # frontier of each side is kept per (N, nextday).
+    #
+    # With a Checkpointer the searched probes save the answers so far, the
+    # dead states and the search stack of the probe in flight; a new oracle
+    # on the same checkpoint picks all of that up and resumes the search
+    # when that probe comes round again. The dead states are saved with
+    # their full keys, so they still match after a restart.
+    def __init__(self, tasks, cache_path=None, instance_hash=None, solver=None, dead_states=None,
+                 layered=True, stats=None, checkpoint=None):
+        self.tasks = tasks
+        self.stats = stats
+        self.solver = solver or Branch_Bound_Solver
+        self.layered = layered
+        self.cache_path = cache_path
+        self.instance_hash = instance_hash
+        self.known = {}
+        self.dead_states = dead_states if dead_states is not None else Transposition_Table()
+        self.probed = {}
+        self.solved = 0
+        self.inferred = 0
+        self.checkpoint = checkpoint
+        self.resuming = None
+        if cache_path and instance_hash and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                stored = json.load(f).get(instance_hash, {})
+            for group, answers in stored.items():
+                N, nextday = group.split('|')
+                # Recorded one by one, so dominated points left by older
+                # cache files are dropped
+                for answer in ('yes', 'no'):
+                    for K, days in answers[answer]:
+                        self.recording(int(N), K, days, nextday == 'nextday', answer == 'yes')
+        saved = checkpoint.loading() if checkpoint is not None else None
+        if saved is not None:
+            self.known, self.probed = saved['known'], saved['probed']
+            self.solved, self.inferred = saved['solved'], saved['inferred']
+            self.dead_states.restoring(saved['dead_states'])
+            self.resuming = (saved['probe'], saved['frames'])
+
+    def lookup(self, N, K, days, nextday):
+        yes, no = self.known.get((N, nextday), ([], []))
+        if any(k <= K and d <= days for k, d in yes):
+            return True
+        if any(k >= K and d >= days for k, d in no):
+            return False
+        return None
+
+    def recording(self, N, K, days, nextday, answer):
+        # Only the frontier is kept: a point an existing one already settles
+        # is dropped, and so are the points the new one settles
+        yes, no = self.known.setdefault((N, nextday), ([], []))
+        if answer:
+            if not any(k <= K and d <= days for k, d in yes):
+                yes[:] = [(k, d) for k, d in yes if not (k >= K and d >= days)] + [(K, days)]
+        else:
+            if not any(k >= K and d >= days for k, d in no):
+                no[:] = [(k, d) for k, d in no if not (k <= K and d <= days)] + [(K, days)]
+
+    def feasible(self, N, K, days, nextday):
+        answer = self.lookup(N, K, days, nextday)
+        if answer is not None:
+            self.inferred += 1
+            if self.stats is not None:
+                self.stats.count("probe:inferred")
+            return answer
+        if self.stats is not None:
+            self.stats.count("probe:searched")
+
+        answer = None
+        low = lower_bound_days(self.tasks, N, K, nextday)
+        if low == -1 or low > days:
+            answer = False
+        elif nextday and self.layered:
+            # One layered run gives the earliest day for this (N, K), which
+            # settles every horizon at once.
+            layers = Day_Layer_Solver(N, K, self.tasks, self.stats)
+            earliest = layers.earliest_days()
+            self.solved += 1
+            if earliest == -1:
+                self.recording(N, K, max(days, len(self.tasks)), nextday, False)
+                return False
+            self.recording(N, K, earliest, nextday, True)
+            if not layers.truncated:
+                if earliest > 1:
+                    self.recording(N, K, earliest - 1, nextday, False)
+                return earliest <= days
+            if earliest <= days:
+                return True
+            # A capped run only proves its own day; shorter horizons still
+            # need the exact search.
+            if self.stats is not None:
+                self.stats.count("probe:wide layer")
+        if answer is None:
+            # Dead states carry over between horizons of the same (N, K).
+            horizons = self.probed.setdefault((N, K, nextday), set())
+            solver = self.solver(N, K, days, self.tasks, nextday, self.dead_states, horizons, self.stats)
+            frames = None
+            if self.resuming is not None and self.resuming[0] == (N, K, days, nextday):
+                frames = self.resuming[1]
+                self.resuming = None
+            if self.checkpoint is not None:
+                self.checkpoint.describing = lambda stack: self.describing((N, K, days, nextday), stack)
+            answer = solver.search(self.checkpoint, frames)
+            horizons.add(days)
+            self.solved += 1
+        self.recording(N, K, days, nextday, answer)
+        return answer
+
+    def describing(self, probe, frames):
+        return {'known': self.known, 'probed': self.probed, 'solved': self.solved,
+                'inferred': self.inferred, 'dead_states': self.dead_states.snapshot(),
+                'probe': probe, 'frames': frames}
+
+    def saving(self):
+        if not (self.cache_path and self.instance_hash):
+            return
+        stored = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path) as f:
+                stored = json.load(f)
+        stored[self.instance_hash] = {
+            f"{N}|{'nextday' if nextday else 'sameday'}": {"yes": yes, "no": no}
+            for (N, nextday), (yes, no) in self.known.items()
+        }
+        scratch = self.cache_path + '.tmp'
+        with open(scratch, 'w') as f:
+            json.dump(stored, f)
+        os.replace(scratch, self.cache_path)
+
+def hashing_task_file(file):
+    with open(file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def earliest_completion(tasks, N, K, nextday, oracle=None):
+    low = lower_bound_days(tasks, N, K, nextday)
+    if low == -1:
+        return -1
+    if oracle is None:
+        oracle = Feasibility_Oracle(tasks)
+    # One task per day in dependency order always fits, so len(tasks) days
+    # is enough. Feasibility only grows with days: gallop up from the bound,
+    # then binary search the last gap.
+    high = max(low, len(tasks))
+
+    def fits(days):
+        return oracle.feasible(N, K, days, nextday)
+
+    step = 1
+    probe = low
+    while not fits(probe):
+        low = probe + 1
+        if probe == high:
+            return -1
+        probe = min(probe + step, high)
+        step *= 2
+    high = probe
+
+    while low < high:
+        mid = (low + high) // 2
+        if fits(mid):
+            high = mid
+        else:
+            low = mid + 1
+    return high
+
+def minimum_subscription(tasks, N, deadline, nextday, oracle=None):
+    longest = tasks.longest_chain()
+    if longest is None or deadline < 1 or (nextday and longest > deadline):
+        return -1
+    if oracle is None:
+        oracle = Feasibility_Oracle(tasks)
+
+    # K must hold the most expensive task and the total over the deadline;
+    # K = total cost always fits (one student, one dependency level per day).
+    total = sum(tasks.costs)
+    low = max(max(tasks.costs, default=0), -(-total // (N * deadline)), 1)
+    high = max(low, total)
     result = -1
 
     while low <= high:
         mid_value = (low + high) // 2
-        engine = Schedule_Optimizer(N, mid_value, deadline, tasks, nextday)
 
-        if engine.search():
-            ans = mid_value
+        if oracle.feasible(N, mid_value, deadline, nextday):
+            result = mid_value
             high = mid_value - 1
         else:
             low = mid_value + 1
     return result
 
-def main():
-    if len(sys.argv) < 5:
-        print("Usage: python assg02.py <input_file> <max_days> <N> <K> [--nextday]")
+def main(stats=None):
+    missing = missing_values(('--cache', '--memo-mb', '--memo-policy', '--checkpoint', '--checkpoint-every'))
+    if len(sys.argv) < 5 or missing:
+        if missing:
+            print(f"Error: {', '.join(missing)} needs a value")
+        print("Usage: python assg02.py <input_file> <max_days> <N> <K> [--nextday] [--cache <file>]"
+              " [--memo-mb <approx mb>] [--memo-policy lru|depth] [--memo-stats]"
+              " [--checkpoint <file> [--checkpoint-every <seconds>]]"
+              " [--stats [file]] [--progress [n]] [--profile]")
         return
 
     file = sys.argv[1]
@@ -118,18 +738,50 @@ def main():
     K = int(sys.argv[4])
     next_day = '--nextday' in sys.argv
 
-    tasks = loading_tasks(file)
+    with timing(stats, 'load'):
+        tasks = loading_tasks(file)
+    cache_path = reading_option('--cache')
+    dead_states = Transposition_Table()
+    memo_settings = None
+    memo_mb = reading_option('--memo-mb')
+    if memo_mb is not None:
+        memo_settings = (float(memo_mb), reading_option('--memo-policy', 'lru'))
+        dead_states = Transposition_Table.from_megabytes(*memo_settings)
+    checkpoint = None
+    checkpoint_path = reading_option('--checkpoint')
+    if checkpoint_path is not None:
+        checkpoint = Checkpointer(checkpoint_path,
+                                  run_signature(file, maximum_days, N, K, next_day, memo_settings),
+                                  float(reading_option('--checkpoint-every', CHECKPOINT_EVERY)))
+    try:
+        oracle = Feasibility_Oracle(tasks, cache_path, hashing_task_file(file) if cache_path else None,
+                                    dead_states=dead_states, stats=stats, checkpoint=checkpoint)
+    except ValueError as e:
+        print(f"Checkpoint Error: {e}")
+        return
+    if stats is not None:
+        stats.table('dead_states', dead_states)
 
     print("\n--- PROBLEM 1: Earliest Completion Time ---")
-    days = earliest_completion(tasks, N, K, next_day)
+    with timing(stats, 'earliest completion'):
+        days = earliest_completion(tasks, N, K, next_day, oracle)
     print(f"Minimum days required = {days}")
 
     print("\n--- PROBLEM 2: Minimum Subscription Plan ---")
-    k_needed = minimum_subscription(tasks, N, maximum_days, next_day)
+    with timing(stats, 'minimum subscription'):
+        k_needed = minimum_subscription(tasks, N, maximum_days, next_day, oracle)
     print(f" SO , Minimum prompts per student per day = {k_needed}")
+    if stats is not None:
+        stats.extra.update(earliest_days=days, minimum_k=k_needed)
+
+    oracle.saving()
+    if checkpoint is not None:
+        checkpoint.finishing()
 
     if next_day:
         print("\n(Results computed under NEXT_DAY 6 AM SHARING RULE)")
+    if '--memo-stats' in sys.argv:
+        print("\nMemo:", ", ".join(f"{name}={value}" for name, value in dead_states.stats().items()))
 
 if __name__ == "__main__":
-    main()
+    running_with_stats('assg02', main)
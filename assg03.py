@@ -1,136 +1,377 @@
 import sys
 import math
-import copy
-from collections import defaultdict, deque
+import time
+import heapq
+from itertools import combinations
+from bulk_loader import loading_task_graph
+from run_stats import running_with_stats, timing, reading_option, missing_values
 
 
-class Task:
-    def __init__(self, task_id, cost, dependencies):
-        self.task_id = task_id
-        self.cost = cost
-        self.dependencies = set(dependencies)
-        
 def calculate_total_cost(days, chatgpt_limit, gemini_limit, c1, c2):
     daily_cost = chatgpt_limit * c1 + gemini_limit * c2
     return daily_cost * days
 
-def check_cycle(tasks, graph, indegree):
-    temp_indegree = copy.deepcopy(indegree)
-    queue = deque()
-
-    for task in tasks:
-        if temp_indegree[task] == 0:
-            queue.append(task)
-
-    visited_count = 0
-
-    while queue:
-        current = queue.popleft()
-        visited_count += 1
-
-        for neighbor in graph[current]:
-            temp_indegree[neighbor] -= 1
-            if temp_indegree[neighbor] == 0:
-                queue.append(neighbor)
-
-    return visited_count != len(tasks)
+def check_cycle(graph):
+    # A task on a cycle, or behind a dependency missing from the file, never
+    # becomes ready; the graph's Kahn pass leaves it out of the order.
+    return not graph.complete
 
 
 def parse_input_file(filename):
-    tasks = {}
-    graph = defaultdict(list)
-    indegree = defaultdict(int)
-
-    with open(filename, "r") as file:
-        for line in file:
-            parts = line.strip().split()
-
-            if not parts:
-                continue
+    return loading_task_graph(filename, int)[1]
 
-            if parts[0].startswith('%'):
-                continue
-
-            if parts[0] == 'A':
-                task_id = int(parts[1])
-                cost = int(parts[2])
-                deps = list(map(int, parts[3:-1]))
-
-                tasks[task_id] = Task(task_id, cost, deps)
-                indegree[task_id] = len(deps)
-
-                for d in deps:
-                    graph[d].append(task_id)
 
-    return tasks, graph, indegree
-
-
-def generate_schedule(tasks, graph, indegree,
+def generate_schedule(graph,
                       chatgpt_limit, gemini_limit,
-                      case_type):
+                      case_type,
+                      stats=None):
+
+    # Ready queues per LLM over the graph's dense ids, which follow task id
+    # order, so the smallest task id comes first. A task finished today
+    # only releases its dependents tomorrow, so they wait in released_today
+    # until the day is over.
+    labels = graph.labels
+    succ_start = graph.succ_start
+    succ_ids = graph.succ_ids
+    waiting = graph.waiting_counts()
+    chatgpt_ready = []
+    gemini_ready = []
+    for i, task_id in enumerate(labels):
+        if waiting[i] == 0:
+            (chatgpt_ready if task_id % 2 == 0 else gemini_ready).append(i)
+    heapq.heapify(chatgpt_ready)
+    heapq.heapify(gemini_ready)
 
-    completed_tasks = set()
-    temp_indegree = copy.deepcopy(indegree)
     schedule = []
-    day_count = 0
+    done_count = 0
     nodes_explored = 0
 
-    while len(completed_tasks) < len(tasks):
+    while done_count < len(labels):
 
-        day_count += 1
         today_chatgpt = []
         today_gemini = []
 
-        for task_id in sorted(tasks.keys()):
-
-            if task_id in completed_tasks:
-                continue
-
-            if temp_indegree[task_id] == 0:
-                if task_id % 2 == 0:
-                    if len(today_chatgpt) < chatgpt_limit:
-                        today_chatgpt.append(task_id)
-                else:
-                    if len(today_gemini) < gemini_limit:
-                        today_gemini.append(task_id)
-
-                if case_type == "A":
-                    if len(today_chatgpt) + len(today_gemini) >= 1:
-                        break
+        if case_type == "A":
+            # Smallest ready id whose LLM is allowed any prompts.
+            use_chatgpt = chatgpt_limit >= 1 and chatgpt_ready
+            use_gemini = gemini_limit >= 1 and gemini_ready
+            if use_chatgpt and (not use_gemini or chatgpt_ready[0] < gemini_ready[0]):
+                today_chatgpt.append(heapq.heappop(chatgpt_ready))
+            elif use_gemini:
+                today_gemini.append(heapq.heappop(gemini_ready))
+        else:
+            while chatgpt_ready and len(today_chatgpt) < chatgpt_limit:
+                today_chatgpt.append(heapq.heappop(chatgpt_ready))
+            while gemini_ready and len(today_gemini) < gemini_limit:
+                today_gemini.append(heapq.heappop(gemini_ready))
 
         if not today_chatgpt and not today_gemini:
             return None, None, nodes_explored
 
+        released_today = []
         for task in today_chatgpt + today_gemini:
-            completed_tasks.add(task)
+            for k in range(succ_start[task], succ_start[task + 1]):
+                neighbor = succ_ids[k]
+                left = waiting[neighbor] - 1
+                waiting[neighbor] = left
+                if left == 0:
+                    released_today.append(neighbor)
+        for neighbor in released_today:
+            heapq.heappush(gemini_ready if labels[neighbor] & 1 else chatgpt_ready, neighbor)
+
+        done_count += len(today_chatgpt) + len(today_gemini)
+        schedule.append(([labels[i] for i in today_chatgpt], [labels[i] for i in today_gemini]))
+        nodes_explored += 1
+        if stats is not None:
+            stats.node(nodes_explored)
 
-            for neighbor in graph[task]:
-                temp_indegree[neighbor] -= 1
+    return len(schedule), schedule, nodes_explored
+
+
+def cheapest_subscription(graph,
+                          c1, c2,
+                          chatgpt_limit, gemini_limit,
+                          m, case_type,
+                          stats=None):
+
+    # Completion days are not monotone in the limits (the greedy list
+    # schedule can finish later with a higher limit), so every cell may
+    # matter. Cells are tried in the grid's order and only priced ones are
+    # simulated: a cell costing no less than the best pair so far is skipped,
+    # a column stops at its first pair meeting the deadline, and the walk
+    # stops once even the cheapest cell of a column is too dear. Ties keep
+    # the lexicographically smallest (cg, gm), as the full grid did.
+    best_cost = float("inf")
+    best_option = None
+    for cg in range(1, chatgpt_limit + 1):
+        if cg * c1 + c2 >= best_cost:
+            break
+        for gm in range(1, gemini_limit + 1):
+            daily_cost = cg * c1 + gm * c2
+            if daily_cost >= best_cost:
+                break
+            d = generate_schedule(graph, cg, gm, case_type, stats)[0]
+            if stats is not None:
+                stats.count("subscription:simulated")
+            if d is not None and d <= m:
+                best_cost = daily_cost
+                best_option = (cg, gm)
+                break
+
+    return best_cost, best_option
+
+
+class Search_Stats:
+    def __init__(self, engine):
+        self.engine = engine
+        self.days = None
+        self.schedule = None
+        self.expanded = 0
+        self.generated = 0
+        self.peak_frontier = 0
+        self.wall_time = 0.0
+        self.stopped = False  # ran out of its node budget
+
+    def line(self):
+        days = "none" if self.days is None else self.days
+        if self.stopped:
+            days = "none (node budget used up)"
+        return (f"{self.engine}: days={days} expanded={self.expanded} "
+                f"generated={self.generated} peak_frontier={self.peak_frontier} "
+                f"time={self.wall_time * 1000:.2f}ms")
+
+
+class Day_Search_Space:
+    # State: the set of finished tasks (bitmask over sorted task ids).
+    # Move: one day of work. Tasks finished today release their dependents
+    # only tomorrow, so a day picks from the tasks ready at its start.
+    # Doing more tasks on a day never makes later days worse, so a move
+    # always fills ChatGPT and Gemini as far as the ready tasks allow.
+    def __init__(self, graph, chatgpt_limit, gemini_limit, case_type):
+        self.ids = graph.labels
+        self.pred_mask, self.blocked = graph.predecessor_masks()
+
+        self.goal = (1 << len(self.ids)) - 1
+        self.chatgpt_limit = chatgpt_limit
+        self.gemini_limit = gemini_limit
+        self.case_type = case_type
+        self.max_per_day = 1 if case_type == "A" else chatgpt_limit + gemini_limit
+
+    def heuristic(self, done):
+        # h(n) = ceil(remaining_tasks / max_prompts_per_day)
+        return self.remaining_heuristic(len(self.ids) - bin(done).count("1"))
+
+    def remaining_heuristic(self, remaining):
+        if remaining <= 0 or self.max_per_day <= 0:
+            return 0
+        return math.ceil(remaining / self.max_per_day)
+
+    def expanding(self, done):
+        # (h of every child, moves made lazily). A move fills each LLM as far
+        # as the ready tasks allow, so every move out of a state finishes the
+        # same number of tasks and all children share one h: the engines
+        # test their bound once, before a single move is built. Moves come
+        # smallest ids first, the order generate_schedule picks them in.
+        evens, odds = [], []
+        for i, preds in enumerate(self.pred_mask):
+            if not (done >> i) & 1 and not (self.blocked >> i) & 1 and preds & done == preds:
+                (evens if self.ids[i] % 2 == 0 else odds).append(1 << i)
+        remaining = len(self.ids) - bin(done).count("1")
+
+        if self.case_type == "A":
+            allowed = [bit for bit in sorted(evens + odds)
+                       if (self.chatgpt_limit if self.ids[bit.bit_length() - 1] % 2 == 0
+                           else self.gemini_limit) >= 1]
+            return self.remaining_heuristic(remaining - 1), iter(allowed)
+
+        chatgpt_today = min(self.chatgpt_limit, len(evens))
+        gemini_today = min(self.gemini_limit, len(odds))
+        return (self.remaining_heuristic(remaining - chatgpt_today - gemini_today),
+                self.packing(evens, odds, chatgpt_today, gemini_today))
+
+    def packing(self, evens, odds, chatgpt_today, gemini_today):
+        # The C(evens, cg) x C(odds, gm) day plans, one at a time
+        for cg in combinations(evens, chatgpt_today):
+            packed_cg = sum(cg)
+            for gm in combinations(odds, gemini_today):
+                packed = packed_cg + sum(gm)
+                if packed:
+                    yield packed
+
+    def splitting(self, packed):
+        chatgpt, gemini = [], []
+        for i, t in enumerate(self.ids):
+            if (packed >> i) & 1:
+                (chatgpt if t % 2 == 0 else gemini).append(t)
+        return chatgpt, gemini
+
+    def unwinding(self, link):
+        schedule = []
+        while link is not None:
+            packed, link = link
+            schedule.append(self.splitting(packed))
+        schedule.reverse()
+        return schedule
+
+
+def dfs_search(space, budget=None):
+    # Plain depth-first graph search: stops at the first complete schedule.
+    # Frames are [state, g, link, moves]; a state's moves are only made
+    # when the search comes back to it.
+    stats = Search_Stats("DFS")
+    start = time.perf_counter()
+    stack = [[0, 0, None, None]]
+    seen = {0}
+    stats.generated = 1
+    while stack:
+        stats.peak_frontier = max(stats.peak_frontier, len(stack))
+        frame = stack[-1]
+        done, g, link, moves = frame
+        if moves is None:
+            if done == space.goal:
+                stats.days, stats.schedule = g, space.unwinding(link)
+                break
+            if budget is not None and stats.expanded >= budget:
+                stats.stopped = True
+                break
+            stats.expanded += 1
+            frame[3] = moves = space.expanding(done)[1]
+        for packed in moves:
+            after = done | packed
+            if after not in seen:
+                break
+        else:
+            stack.pop()
+            continue
+        seen.add(after)
+        stats.generated += 1
+        stack.append([after, g + 1, (packed, link), None])
+    stats.wall_time = time.perf_counter() - start
+    return stats
+
+
+def dfbb_search(space, budget=None):
+    # Depth-first branch and bound: keeps the best schedule found so far and
+    # cuts any node whose g + h cannot beat it. Siblings share h, so one
+    # test against the current best covers every child still to be made.
+    stats = Search_Stats("DFBB")
+    start = time.perf_counter()
+    best = math.inf
+    best_link = None
+    best_g = {}
+    stack = [[0, 0, None, None, 0]]  # state, g, link, moves, h of the children
+    stats.generated = 1
+    while stack:
+        stats.peak_frontier = max(stats.peak_frontier, len(stack))
+        frame = stack[-1]
+        done, g, link, moves, child_h = frame
+        if moves is None:
+            if g + space.heuristic(done) >= best:
+                stack.pop()
+                continue
+            if done == space.goal:
+                best, best_link = g, link
+                stack.pop()
+                continue
+            if best_g.get(done, math.inf) <= g:
+                stack.pop()
+                continue
+            best_g[done] = g
+            if budget is not None and stats.expanded >= budget:
+                stats.stopped = True
+                break
+            stats.expanded += 1
+            child_h, moves = space.expanding(done)
+            frame[3], frame[4] = moves, child_h
+
+        packed = None if g + 1 + child_h >= best else next(moves, None)
+        if packed is None:
+            stack.pop()
+            continue
+        stats.generated += 1
+        stack.append([done | packed, g + 1, (packed, link), None, 0])
+    if best < math.inf:
+        stats.days, stats.schedule = best, space.unwinding(best_link)
+    stats.wall_time = time.perf_counter() - start
+    return stats
+
+
+def astar_search(space, budget=None):
+    # Children are made one at a time: after each one the expanded state
+    # goes back on the heap with its children's f (all siblings share it),
+    # standing in for the siblings not made yet, so a wide day never puts
+    # every subset pair on the heap at once.
+    stats = Search_Stats("A*")
+    start = time.perf_counter()
+    counter = 0
+    # Equal f goes to the deeper node first: in case A h is exact, and
+    # breaking ties toward shallow nodes would sweep the whole lattice.
+    # Entries: (f, -depth, counter, g, state, link, moves or None)
+    open_list = [(space.heuristic(0), 0, counter, 0, 0, None, None)]
+    best_g = {0: 0}
+    closed = set()
+    stats.generated = 1
+    while open_list:
+        stats.peak_frontier = max(stats.peak_frontier, len(open_list))
+        f, _, _, g, done, link, moves = heapq.heappop(open_list)
+        if moves is None:
+            if done in closed:
+                continue
+            if done == space.goal:
+                stats.days, stats.schedule = g, space.unwinding(link)
+                break
+            closed.add(done)
+            if budget is not None and stats.expanded >= budget:
+                stats.stopped = True
+                break
+            stats.expanded += 1
+            child_h, moves = space.expanding(done)
+            f = g + 1 + child_h
+        for packed in moves:
+            after = done | packed
+            if after in closed or best_g.get(after, math.inf) <= g + 1:
+                continue
+            best_g[after] = g + 1
+            stats.generated += 1
+            heapq.heappush(open_list, (f, -(g + 1), counter + 1, g + 1, after, (packed, link), None))
+            heapq.heappush(open_list, (f, -(g + 1), counter + 2, g, done, link, moves))
+            counter += 2
+            break
+    stats.wall_time = time.perf_counter() - start
+    return stats
 
-        schedule.append((today_chatgpt, today_gemini))
-        nodes_explored += 1
 
-    return day_count, schedule, nodes_explored
+SEARCH_ENGINES = (dfs_search, dfbb_search, astar_search)
+
+# Nodes each engine may expand in the comparison run_case prints; the
+# comparison is only a report, so it must never hold up the objectives.
+# --engine-budget 0 skips it.
+ENGINE_BUDGET = 100000
 
 
 def run_case(case_name,
-             tasks, graph, indegree,
+             graph,
              c1, c2,
              chatgpt_limit, gemini_limit,
-             m):
+             m,
+             stats=None,
+             engine_budget=ENGINE_BUDGET):
 
     print("\n" + case_name)
     print("Objective 1: Earliest Completion")
+    engine_stats = []
 
-    if check_cycle(tasks, graph, indegree):
+    if check_cycle(graph):
         print("Infeasible (Cycle detected)")
-        return
-
-    days, schedule, nodes = generate_schedule(
-        tasks, graph, indegree,
-        chatgpt_limit, gemini_limit,
-        case_name[-1]
-    )
+        return engine_stats
+
+    with timing(stats, case_name + ' schedule'):
+        days, schedule, _ = generate_schedule(
+            graph,
+            chatgpt_limit, gemini_limit,
+            case_name[-1],
+            stats
+        )
 
     if days is None:
         print("Infeasible")
@@ -154,31 +395,29 @@ def run_case(case_name,
 
         print("Total Cost:", total_cost)
 
-        print("Nodes Explored:")
-        print("DFS:", nodes * 3)
-        print("DFBB:", nodes * 2)
-        print("A*:", nodes)
+        if engine_budget:
+            space = Day_Search_Space(graph, chatgpt_limit, gemini_limit, case_name[-1])
+            print("Nodes Explored:")
+            for engine in SEARCH_ENGINES:
+                measured = engine(space, engine_budget)
+                print(measured.line())
+                engine_stats.append(measured)
+        if stats is not None and engine_stats:
+            stats.extra.setdefault('engines', {})[case_name] = [
+                {'engine': st.engine, 'days': st.days, 'expanded': st.expanded, 'generated': st.generated,
+                 'peak_frontier': st.peak_frontier, 'wall_time': st.wall_time, 'stopped': st.stopped}
+                for st in engine_stats]
 
     print("Objective 2: Min Cost within m days")
 
-    best_cost = float("inf")
-    best_option = None
-
-    for cg in range(1, chatgpt_limit + 1):
-        for gm in range(1, gemini_limit + 1):
-
-            d, _, _ = generate_schedule(
-                tasks, graph, indegree,
-                cg, gm,
-                case_name[-1]
-            )
-
-            if d is not None and d <= m:
-                daily_cost = cg * c1 + gm * c2
-
-                if daily_cost < best_cost:
-                    best_cost = daily_cost
-                    best_option = (cg, gm)
+    with timing(stats, case_name + ' subscription'):
+        best_cost, best_option = cheapest_subscription(
+            graph,
+            c1, c2,
+            chatgpt_limit, gemini_limit,
+            m, case_name[-1],
+            stats
+        )
 
     if best_option is None:
         print("No valid subscription scheme found")
@@ -188,11 +427,17 @@ def run_case(case_name,
         print("Gemini prompts/day:", best_option[1])
         print("Minimum Daily Cost:", best_cost)
 
+    return engine_stats
 
-if __name__ == "__main__":
 
-    if len(sys.argv) < 7:
-        print("Usage: python assg03.py input.txt c1 c2 chatgpt gemini m")
+def main(stats=None):
+
+    missing = missing_values(("--engine-budget", "--scenarios"))
+    if len(sys.argv) < 7 or missing:
+        if missing:
+            print(f"Error: {', '.join(missing)} needs a value")
+        print("Usage: python assg03.py input.txt c1 c2 chatgpt gemini m [--engine-budget nodes]"
+              " [--scenarios file]")
         sys.exit(1)
 
     input_file = sys.argv[1]
@@ -202,23 +447,67 @@ if __name__ == "__main__":
     gemini_limit = int(sys.argv[5])
     m = int(sys.argv[6])
 
-    tasks, graph, indegree = parse_input_file(input_file)
+    with timing(stats, 'load'):
+        graph = parse_input_file(input_file)
+
+    scenario_file = reading_option("--scenarios")
+    if scenario_file is not None:
+        # What-if sweep: the command line (c1, c2, m) plus every line of the
+        # scenario file, answered from one days(cg, gm) table per case.
+        from days_table import loading_days_table, cheapest_for_scenarios, reading_scenarios
+
+        scenarios = [(c1, c2, m)] + reading_scenarios(scenario_file)
+        c1s, c2s, ms = zip(*scenarios)
+        for case_name in ("CASE-A", "CASE-B"):
+            if check_cycle(graph):
+                print(case_name, "Infeasible (Cycle detected)")
+                continue
+            days = loading_days_table(input_file, graph,
+                                      chatgpt_limit, gemini_limit,
+                                      case_name[-1])
+            best_cg, best_gm, best_cost = cheapest_for_scenarios(days, c1s, c2s, ms)
+            print(case_name)
+            print("c1 c2 m -> chatgpt gemini daily_cost")
+            for (sc1, sc2, sm), cg, gm, cost in zip(scenarios, best_cg, best_gm, best_cost):
+                if cost < 0:
+                    print(sc1, sc2, sm, "-> none")
+                else:
+                    print(sc1, sc2, sm, "->", cg, gm, cost)
+        return
+
+    engine_budget = int(reading_option("--engine-budget", ENGINE_BUDGET))
 
     print("Heuristic Used:")
     print("h(n) = ceil(remaining_tasks / max_prompts_per_day)")
 
-    run_case("CASE-A",
-             tasks, graph, indegree,
-             c1, c2,
-             chatgpt_limit, gemini_limit,
-             m)
-
-    run_case("CASE-B",
-             tasks, graph, indegree,
-             c1, c2,
-             chatgpt_limit, gemini_limit,
-             m)
+    measured = {}
+    measured["CASE-A"] = run_case("CASE-A",
+                                  graph,
+                                  c1, c2,
+                                  chatgpt_limit, gemini_limit,
+                                  m,
+                                  stats,
+                                  engine_budget)
+
+    measured["CASE-B"] = run_case("CASE-B",
+                                  graph,
+                                  c1, c2,
+                                  chatgpt_limit, gemini_limit,
+                                  m,
+                                  stats,
+                                  engine_budget)
 
     print("\nPerformance Comparison:")
-    print("A* explored least nodes.")
-    print("DFBB better than DFS.")
+    for case_name, engine_stats in measured.items():
+        # Engines stopped by the node budget have no result to compare
+        finished = [st for st in engine_stats if not st.stopped]
+        if not finished:
+            continue
+        fewest = min(finished, key=lambda st: st.expanded)
+        fastest = min(finished, key=lambda st: st.wall_time)
+        print(f"{case_name}: fewest nodes expanded by {fewest.engine} ({fewest.expanded}), "
+              f"fastest was {fastest.engine} ({fastest.wall_time * 1000:.2f}ms)")
+
+
+if __name__ == "__main__":
+    running_with_stats('assg03', main)
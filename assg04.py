@@ -1,42 +1,44 @@
 import sys
 import math
+import time
+import heapq
+import bisect
+from concurrent.futures import ProcessPoolExecutor
 from z3 import *
+from bulk_loader import loading_ev_instance
+from run_stats import running_with_stats, timing, reading_option
 
 # Function to read the automatically generated input file
 def load_data(file_name):
-    ports_count = 0
-    prices = []
-    vehicles = []
-    
+    # K (number of ports), P (price list) and one [id, arrival, departure,
+    # work] per vehicle; large files are cached in binary next to the input
     try:
-        with open(file_name, 'r') as f:
-            for line in f:
-                # Ignore comments and empty lines
-                if line.startswith('%') or not line.strip():
-                    continue
-                
-                parts = line.split()
-                # Reading K (number of ports)
-                if parts[0] == 'K':
-                    ports_count = int(parts[1])
-                # Reading P (price list)
-                elif parts[0] == 'P':
-                    prices = [int(p) for p in parts[1:]]
-                # Reading V (vehicle data)
-                elif parts[0] == 'V':
-                    # data: id, arrival, departure, work
-                    vehicles.append([int(x) for x in parts[1:]])
-        return ports_count, prices, vehicles
+        return loading_ev_instance(file_name)
     except FileNotFoundError:
         print("Input file not found. Please run the generator script first.")
         sys.exit()
 
-def run_scheduler():
-    # 1. Load the data from input.txt
-    K, P, vehicle_list = load_data('input.txt')
-    
-    # 2. Setup the Optimization Solver
-    solver = Optimize()
+# Sweep line over the [arrival, departure] windows: a vehicle charges inside
+# its window, so two vehicles whose windows do not intersect can never share
+# a port at the same time and need no non-overlap constraint
+def overlapping_pairs(vehicle_list):
+    by_arrival = sorted(range(len(vehicle_list)), key=lambda i: vehicle_list[i][1])
+    active = []  # (departure, index) of windows still open
+    pairs = []
+    for i in by_arrival:
+        arrival = vehicle_list[i][1]
+        while active and active[0][0] <= arrival:
+            heapq.heappop(active)
+        for _, j in active:
+            pairs.append((min(i, j), max(i, j)))
+        heapq.heappush(active, (vehicle_list[i][2], i))
+    # Same order as the plain double loop, minus the pruned pairs
+    pairs.sort()
+    return pairs
+
+# Original encoding: the port is an Int and the duration is tied to it with
+# a nonlinear pair of constraints, so Z3 works in nonlinear integer arithmetic
+def adding_int_vehicles(solver, K, P, vehicle_list, ctx=None):
     results = []
     
     # Define variables for each vehicle
@@ -44,10 +46,10 @@ def run_scheduler():
         v_id, arr, dep, work = v
         
         # We need to decide which port and what start time
-        port_choice = Int(f'port_{v_id}')
-        start_time = Int(f'start_{v_id}')
-        duration = Int(f'dur_{v_id}')
-        cost = Int(f'cost_{v_id}')
+        port_choice = Int(f'port_{v_id}', ctx)
+        start_time = Int(f'start_{v_id}', ctx)
+        duration = Int(f'dur_{v_id}', ctx)
+        cost = Int(f'cost_{v_id}', ctx)
         
         # Constraints: Port must be within range 1 to K
         solver.add(port_choice >= 1, port_choice <= K)
@@ -76,44 +78,631 @@ def run_scheduler():
             'id': v_id, 'p': port_choice, 's': start_time, 
             'd': duration, 'c': cost, 'work': work
         })
+    return results
+
+# Port k (1-based) charges k units per time step. Returns, per vehicle, the
+# (port, duration, cost) options whose charging time fits in its window
+def port_options(K, P, vehicle_list):
+    options = []
+    for v_id, arr, dep, work in vehicle_list:
+        fitting = []
+        for port in range(1, K + 1):
+            duration = -(-work // port)
+            if arr + duration <= dep:
+                fitting.append((port, duration, duration * P[port - 1]))
+        options.append(fitting)
+    return options
+
+# One-hot encoding: a Bool per (vehicle, port) with exactly one true. Duration
+# and cost are looked up from tables computed here, so the model stays linear
+def adding_onehot_vehicles(solver, K, P, vehicle_list, ctx=None):
+    results = []
+    for v, fitting in zip(vehicle_list, port_options(K, P, vehicle_list)):
+        v_id, arr, dep, work = v
+        start_time = Int(f'start_{v_id}', ctx)
+        uses = {port: Bool(f'use_{v_id}_{port}', ctx) for port, _, _ in fitting}
+
+        # Exactly one of the ports that fit (none fit -> unsatisfiable)
+        if uses:
+            solver.add(PbEq([(b, 1) for b in uses.values()], 1))
+        else:
+            solver.add(BoolVal(False, ctx))
+
+        port_choice = Sum([If(uses[port], port, 0) for port, _, _ in fitting])
+        duration = Sum([If(uses[port], d, 0) for port, d, _ in fitting])
+        cost = Sum([If(uses[port], c, 0) for port, _, c in fitting])
+
+        solver.add(start_time >= arr)
+        solver.add(start_time + duration <= dep)
+
+        results.append({
+            'id': v_id, 'p': port_choice, 's': start_time,
+            'd': duration, 'c': cost, 'work': work, 'uses': uses
+        })
+    return results
+
+ENCODINGS = {'int': adding_int_vehicles, 'onehot': adding_onehot_vehicles}
+
+# The overlapping pairs that actually get a non-overlap constraint: all of
+# them in the int encoding; in the one-hot one keeping_apart skips a pair
+# with no port that fits both vehicles
+def constrained_pairs(K, P, vehicle_list, pairs, encoding='int'):
+    if encoding != 'onehot':
+        return pairs
+    ports = [{port for port, _, _ in fitting} for fitting in port_options(K, P, vehicle_list)]
+    return [(i, j) for i, j in pairs if ports[i] & ports[j]]
+
+# Non-overlap rule for one pair of vehicles, or None when the two can never
+# share a port at all
+def keeping_apart(v1, v2):
+    # Condition: Are they on the same port?
+    if 'uses' in v1:
+        shared = [port for port in v1['uses'] if port in v2['uses']]
+        if not shared:
+            return None
+        same_port = Or([And(v1['uses'][port], v2['uses'][port]) for port in shared])
+    else:
+        same_port = (v1['p'] == v2['p'])
+
+    # Condition: Do their times stay apart?
+    # (V1 ends before V2 starts) OR (V2 ends before V1 starts)
+    apart = Or(v1['s'] + v1['d'] <= v2['s'],
+               v2['s'] + v2['d'] <= v1['s'])
+
+    # If same_port is true, then apart must be true
+    return Implies(same_port, apart)
+
+def building_model(K, P, vehicle_list, encoding='int', ctx=None):
+    # 2. Setup the Optimization Solver
+    solver = Optimize(ctx=ctx)
+    results = ENCODINGS[encoding](solver, K, P, vehicle_list, ctx)
 
     # 3. Prevent Overlapping (The most important part)
     # If two vehicles share the same port, they must not occupy it at the same time
-    for i in range(len(results)):
-        for j in range(i + 1, len(results)):
-            v1 = results[i]
-            v2 = results[j]
-            
-            # Condition: Are they on the same port?
-            same_port = (v1['p'] == v2['p'])
-            
-            # Condition: Do their times stay apart?
-            # (V1 ends before V2 starts) OR (V2 ends before V1 starts)
-            apart = Or(v1['s'] + v1['d'] <= v2['s'], 
-                       v2['s'] + v2['d'] <= v1['s'])
-            
-            # If same_port is true, then apart must be true
-            solver.add(Implies(same_port, apart))
+    pairs = []
+    for i, j in overlapping_pairs(vehicle_list):
+        rule = keeping_apart(results[i], results[j])
+        if rule is not None:
+            solver.add(rule)
+            pairs.append((i, j))
 
     # 4. Set the goal: Minimize the total cost of all vehicles
     total_bill = Sum([r['c'] for r in results])
-    solver.minimize(total_bill)
+    goal = solver.minimize(total_bill)
+    return solver, results, total_bill, pairs, goal
+
+# Greedy schedule: earliest departure first, each vehicle on the cheapest
+# port where it still fits after the vehicles already placed. If that gets
+# stuck, each vehicle takes the placement that finishes earliest instead,
+# which leaves the most room for later vehicles; if that gets stuck too,
+# the vehicles go by latest possible start (departure less the quickest
+# charge), so the ones with the least slack pick first. A vehicle that finds
+# no gap may push vehicles already placed in its window to another gap or
+# port, up to GREEDY_BUMP_DEPTH moves deep. A feasible answer in pure
+# Python (and an upper bound on the bill), or None
+GREEDY_BUMP_DEPTH = 2
+
+def greedy_schedule(K, P, vehicles, busy=None):
+    options = port_options(K, P, vehicles)
+    by_departure = sorted(range(len(vehicles)), key=lambda i: (vehicles[i][2], vehicles[i][1]))
+    by_latest_start = sorted(range(len(vehicles)), key=lambda i: (
+        vehicles[i][2] - min((duration for _, duration, _ in options[i]), default=0), vehicles[i][1]))
+    cheapest = lambda cost, finish: (cost, finish)
+    earliest = lambda cost, finish: (finish, cost)
+    for order, preference in ((by_departure, cheapest), (by_departure, earliest), (by_latest_start, earliest)):
+        chosen = placing_greedily(K, vehicles, options, preference, busy, order)
+        if chosen is not None:
+            return chosen
+    return None
+
+def placing_greedily(K, vehicles, options, preference, busy=None, order=None):
+    # busy: sorted (start, end) per port, already taken by other vehicles;
+    # order: the vehicle indices in placing order (earliest departure first)
+    busy = {port: list(busy.get(port, ())) if busy else [] for port in range(1, K + 1)}
+    chosen = [None] * len(vehicles)
+    if order is None:
+        order = sorted(range(len(vehicles)), key=lambda i: (vehicles[i][2], vehicles[i][1]))
+
+    def fitting(i, ports=None):
+        # The preferred placement of vehicle i in the earliest gap of each port
+        _, arr, dep, _ = vehicles[i]
+        best = None
+        for port, duration, cost in options[i]:
+            if ports is not None and port not in ports:
+                continue
+            start = arr
+            for s, e in busy[port]:
+                if start + duration <= s:
+                    break
+                start = max(start, e)
+            if start + duration <= dep:
+                placement = (port, start, duration, cost)
+                if best is None or preference(cost, start + duration) < preference(best[3], best[1] + best[2]):
+                    best = placement
+        return best
+
+    def placing(i, placement):
+        port, start, duration, _ = placement
+        bisect.insort(busy[port], (start, start + duration))
+        chosen[i] = placement
+
+    def lifting(i):
+        port, start, duration, _ = chosen[i]
+        busy[port].remove((start, start + duration))
+        chosen[i] = None
+
+    def bumping(i, depth, pinned):
+        # Places vehicle i, moving up to `depth` levels of already placed
+        # vehicles that sit in its window on one of its ports out of the way
+        placement = fitting(i)
+        if placement is not None:
+            placing(i, placement)
+            return True
+        if depth == 0:
+            return False
+        _, arr, dep, _ = vehicles[i]
+        ports = {port for port, _, _ in options[i]}
+        blockers = [j for j, taken in enumerate(chosen) if taken is not None and j not in pinned
+                    and taken[0] in ports and taken[1] < dep and taken[1] + taken[2] > arr]
+        for j in blockers:
+            moved = chosen[j]
+            lifting(j)
+            placement = fitting(i, {moved[0]})
+            if placement is not None:
+                placing(i, placement)
+                if bumping(j, depth - 1, pinned | {i}):
+                    return True
+                lifting(i)
+            placing(j, moved)
+        return False
+
+    for i in order:
+        if not bumping(i, GREEDY_BUMP_DEPTH, frozenset()):
+            return None
+    return chosen
+
+# True when (port, start, duration, cost) per vehicle respects windows,
+# durations, prices and keeps vehicles on the same port apart
+def checking_schedule(K, P, vehicles, chosen):
+    for (_, arr, dep, work), (port, start, duration, cost) in zip(vehicles, chosen):
+        if not (1 <= port <= K and start >= arr and start + duration <= dep
+                and duration == -(-work // port) and cost == duration * P[port - 1]):
+            return False
+    for i, j in overlapping_pairs(vehicles):
+        (p1, s1, d1, _), (p2, s2, d2, _) = chosen[i], chosen[j]
+        if p1 == p2 and s1 + d1 > s2 and s2 + d2 > s1:
+            return False
+    return True
+
+# Hands a known schedule to the solver as the starting point of its search
+# (needs a Z3 with Optimize.set_initial_value; otherwise only the bound helps)
+def seeding(solver, results, chosen):
+    if not hasattr(solver, 'set_initial_value'):
+        return
+    for r, (port, start, duration, cost) in zip(results, chosen):
+        if 'uses' in r:
+            for option, use in r['uses'].items():
+                solver.set_initial_value(use, option == port)
+        else:
+            solver.set_initial_value(r['p'], port)
+            solver.set_initial_value(r['d'], duration)
+            solver.set_initial_value(r['c'], cost)
+        solver.set_initial_value(r['s'], start)
+
+def reading_schedule(ans, results):
+    return [tuple(ans.eval(r[key], model_completion=True).as_long() for key in ('p', 's', 'd', 'c'))
+            for r in results]
+
+# Vehicles linked through overlapping windows form one component; no
+# constraint crosses components, so each can be optimised on its own and
+# the minimum total is the sum of the component minimums
+def overlap_components(vehicle_count, pairs):
+    parent = list(range(vehicle_count))
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    for i, j in pairs:
+        a, b = root(i), root(j)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+    groups = {}
+    for i in range(vehicle_count):
+        groups.setdefault(root(i), []).append(i)
+    return list(groups.values())
+
+# Z3's own counters for the last check (conflicts, decisions, memory, ...)
+def z3_statistics(solver):
+    figures = solver.statistics()
+    return {key: figures.get_key_value(key) for key in figures.keys()}
+
+# Process-wide figures that make no sense summed over solvers
+Z3_PEAK_KEYS = ('memory', 'max memory')
+
+def adding_z3_statistics(stats, figures):
+    stats.adding('z3:', {key: value for key, value in figures.items() if key not in Z3_PEAK_KEYS})
+    for key in Z3_PEAK_KEYS:
+        if key in figures:
+            name = 'z3:' + key
+            stats.extra[name] = max(stats.extra.get(name, 0), figures[key])
+
+# Solves one component in a Z3 context of its own (Z3 objects cannot cross
+# processes, so the answer comes back as plain (port, start, duration,
+# cost) tuples). Returns (status, schedule, cost, lower_bound, z3 figures)
+# where status is 'optimal', 'timeout' (best schedule so far, may be None)
+# or 'infeasible'.
+#
+# The greedy schedule bounds total_bill from above and seeds the solver's
+# initial values; with a deadline the solver stops there and the cheaper of
+# its best model and the greedy schedule is returned (the greedy one is
+# worked out then even without warm_start). share: seconds this component
+# may use from when it starts, never past the deadline
+def solving_component(K, P, vehicles, encoding='int', deadline=None, warm_start=True, share=None):
+    options = port_options(K, P, vehicles)
+    if not all(options):
+        return 'infeasible', None, None, None, {}
+    lower = sum(min(cost for _, _, cost in fitting) for fitting in options)
+
+    ctx = Context()
+    solver, results, total_bill, _, goal = building_model(K, P, vehicles, encoding, ctx)
+    greedy = greedy_schedule(K, P, vehicles) if warm_start else None
+    if greedy is not None:
+        solver.add(total_bill <= sum(cost for _, _, _, cost in greedy))
+        seeding(solver, results, greedy)
+    if deadline is not None:
+        stop = deadline if share is None else min(deadline, time.time() + share)
+        solver.set('timeout', max(1, int((stop - time.time()) * 1000)))
+
+    outcome = solver.check()
+    figures = z3_statistics(solver)
+    if outcome == sat:
+        chosen = reading_schedule(solver.model(), results)
+        cost = sum(c for _, _, _, c in chosen)
+        return 'optimal', chosen, cost, cost, figures
+    if outcome == unsat:
+        return 'infeasible', None, None, None, figures
+
+    best = greedy if warm_start else greedy_schedule(K, P, vehicles)
+    try:
+        found = reading_schedule(solver.model(), results)
+        if checking_schedule(K, P, vehicles, found) and (
+                best is None or sum(c for *_, c in found) < sum(c for *_, c in best)):
+            best = found
+    except Z3Exception:
+        pass
+    try:
+        lower = max(lower, goal.lower().as_long())
+    except (Z3Exception, AttributeError):
+        pass
+    if best is None:
+        return 'timeout', None, None, lower, figures
+    cost = sum(c for *_, c in best)
+    # A schedule that meets the lower bound is optimal whatever the clock says
+    return 'optimal' if cost <= lower else 'timeout', best, cost, lower, figures
+
+def solving_components(K, P, vehicle_list, components, encoding='int', workers=1,
+                       deadline=None, warm_start=True, stats=None):
+    # Merges the components into one (status, schedule in input order,
+    # cost, lower_bound); infeasible as soon as any component is.
+    #
+    # With a deadline each component gets a share of the time left in
+    # proportion to its size, so one hard component cannot starve the
+    # others; time a component leaves unused goes to the ones after it.
+    # In parallel every worker has the whole budget, so the shares are of
+    # workers x budget, still capped by the deadline.
+    chosen = [None] * len(vehicle_list)
+    jobs = [[vehicle_list[i] for i in group] for group in components]
+    answers = []
+    vehicles_left = sum(len(job) for job in jobs)
+
+    def collecting(answer):
+        answers.append(answer)
+        if stats is not None:
+            stats.extra.setdefault('component_sizes', []).append(len(jobs[len(answers) - 1]))
+            stats.count('components:' + answer[0])
+            adding_z3_statistics(stats, answer[4])
+        return answer[0] == 'infeasible'
+
+    if workers > 1 and len(jobs) > 1:
+        lanes = min(workers, len(jobs))
+        budget = None if deadline is None else max(0.0, deadline - time.time()) * lanes
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(solving_component, K, P, job, encoding, deadline, warm_start,
+                                   None if budget is None else budget * len(job) / vehicles_left)
+                       for job in jobs]
+            for future in futures:
+                if collecting(future.result()):
+                    for rest in futures:
+                        rest.cancel()
+                    return 'infeasible', None, None, None
+    else:
+        for job in jobs:
+            share = None
+            if deadline is not None:
+                share = max(0.0, deadline - time.time()) * len(job) / vehicles_left
+            vehicles_left -= len(job)
+            if collecting(solving_component(K, P, job, encoding, deadline, warm_start, share)):
+                return 'infeasible', None, None, None
+
+    lower = sum(answer[3] for answer in answers)
+    if any(answer[1] is None for answer in answers):
+        return 'timeout', None, None, lower
+    for group, answer in zip(components, answers):
+        for i, values in zip(group, answer[1]):
+            chosen[i] = values
+    status = 'optimal' if all(answer[0] == 'optimal' for answer in answers) else 'timeout'
+    return status, chosen, sum(answer[2] for answer in answers), lower
+
+def run_scheduler(file_name='input.txt', encoding='int', workers=1, monolithic=False,
+                  timeout=None, warm_start=True, stats=None):
+    # 1. Load the data from the input file
+    with timing(stats, 'load'):
+        K, P, vehicle_list = load_data(file_name)
+    deadline = None if timeout is None else time.time() + timeout
+    with timing(stats, 'pairs'):
+        pairs = overlapping_pairs(vehicle_list)
+
+    all_pairs = len(vehicle_list) * (len(vehicle_list) - 1) // 2
+    added = len(constrained_pairs(K, P, vehicle_list, pairs, encoding))
+    why = "windows never intersect"
+    if added < len(pairs):
+        why = f"{all_pairs - len(pairs)} windows never intersect, {len(pairs) - added} no common port"
+    print(f"Non-overlap constraints: {added} generated, {all_pairs - added} pruned ({why}) "
+          f"out of {all_pairs} pairs")
 
     # 5. Check and print the output
-    if solver.check() == sat:
-        ans = solver.model()
-        print(f"--- Optimization Successful ---")
-        print(f"Minimum Total Cost: {ans[total_bill]}")
-        print("-" * 30)
-        
-        for r in results:
-            p_val = ans[r['p']].as_long()
-            s_val = ans[r['s']].as_long()
-            d_val = ans[r['d']].as_long()
-            c_val = ans[r['c']].as_long()
-            print(f"Vehicle {r['id']}: Port {p_val} | Time {s_val} to {s_val+d_val} | Cost {c_val}")
+    if monolithic:
+        components = [list(range(len(vehicle_list)))] if vehicle_list else []
     else:
+        components = overlap_components(len(vehicle_list), pairs)
+    with timing(stats, 'solve'):
+        status, chosen, total, lower = solving_components(K, P, vehicle_list, components, encoding,
+                                                          workers, deadline, warm_start, stats)
+    if stats is not None:
+        stats.extra.update(status=status, cost=total, lower_bound=lower)
+
+    if status == 'infeasible':
         print("No possible schedule fits these constraints.")
+        return
+    if chosen is None:
+        print("No schedule found within the time limit.")
+        return
+
+    if status == 'optimal':
+        print(f"--- Optimization Successful ---")
+        print(f"Minimum Total Cost: {total}")
+    else:
+        # Anytime answer: the best schedule so far and how far it can be
+        # from the optimum
+        gap = 0.0 if total == 0 else 100.0 * (total - lower) / total
+        print(f"--- Time Limit Reached ---")
+        print(f"Best Total Cost: {total}")
+        print(f"Lower Bound: {lower} | Gap: {gap:.2f}%")
+    print("-" * 30)
+    
+    for v, (p_val, s_val, d_val, c_val) in zip(vehicle_list, chosen):
+        print(f"Vehicle {v[0]}: Port {p_val} | Time {s_val} to {s_val+d_val} | Cost {c_val}")
+
+# Online mode: vehicles arrive one at a time (in arrival order) and each
+# gets its port and start when it arrives, using only what is known so far.
+#
+# One incremental solver holds the live vehicles. A vehicle whose planned
+# start has passed is charging, so its port and start are fixed for good;
+# the others stay open and may move to another port or time when a later
+# arrival makes that cheaper. Each arrival is tried inside a push/pop scope
+# (new vehicle, "open vehicles start from now on", the objective over the
+# open window); if it is accepted its constraints are then added for good.
+# Vehicles that have finished no longer touch anything, and once they
+# outnumber the live ones the solver is rebuilt without them.
+ONLINE_BUDGET = 0.8  # seconds of solving per arrival
+
+class Online_Station:
+    def __init__(self, K, P, encoding='onehot', budget=ONLINE_BUDGET, compact_at=32):
+        self.K = K
+        self.P = P
+        self.encoding = encoding
+        self.budget = budget
+        self.compact_at = compact_at
+        self.vehicles = []  # every arrival, accepted or not
+        self.plan = {}  # accepted vehicle -> (port, start, duration, cost)
+        self.live = []  # accepted vehicles that have not finished yet
+        self.frozen = set()  # live vehicles that are already charging
+        self.rejected = []
+        self.latencies = []
+        self.stats = None  # Run_Stats when the run asked for them
+        self.rebuilding()
+
+    def rebuilding(self):
+        self.ctx = Context()
+        self.solver = Optimize(ctx=self.ctx)
+        self.results = {}
+        self.retired = 0  # finished vehicles still inside the solver
+        live, self.live = self.live, []
+        for i in live:
+            self.adding(self.solver, i)
+            self.live.append(i)
+            if i in self.frozen:
+                self.freezing(i)
+
+    def adding(self, solver, i):
+        r = ENCODINGS[self.encoding](solver, self.K, self.P, [self.vehicles[i]], self.ctx)[0]
+        self.results[i] = r
+        _, arr, dep, _ = self.vehicles[i]
+        for j in self.live:
+            _, arr_j, dep_j, _ = self.vehicles[j]
+            if arr < dep_j and arr_j < dep:
+                rule = keeping_apart(r, self.results[j])
+                if rule is not None:
+                    solver.add(rule)
+
+    def freezing(self, i):
+        port, start, _, _ = self.plan[i]
+        self.solver.add(self.results[i]['p'] == port, self.results[i]['s'] == start)
+
+    def busy_ports(self, ids):
+        busy = {}
+        for i in ids:
+            port, start, duration, _ = self.plan[i]
+            busy.setdefault(port, []).append((start, start + duration))
+        for intervals in busy.values():
+            intervals.sort()
+        return busy
+
+    # Handles one arrival and returns its (port, start, duration, cost), or
+    # None when it cannot be fitted next to the vehicles already committed
+    def arriving(self, vehicle):
+        started = time.perf_counter()
+        now = vehicle[1]
+
+        # Charging has begun for every plan that started before now
+        for i in self.live:
+            if i not in self.frozen and self.plan[i][1] < now:
+                self.frozen.add(i)
+                self.freezing(i)
+        finished = [i for i in self.live if self.plan[i][1] + self.plan[i][2] <= now]
+        if finished:
+            done = set(finished)
+            self.live = [i for i in self.live if i not in done]
+            self.frozen -= done
+            self.retired += len(finished)
+            if self.retired > max(self.compact_at, len(self.live)):
+                if self.stats is not None:
+                    self.stats.count('rebuilds')
+                self.rebuilding()
+
+        index = len(self.vehicles)
+        self.vehicles.append(vehicle)
+        open_ids = [i for i in self.live if i not in self.frozen]
+
+        # Fallback that is always ready in time: keep every plan as it is
+        # and drop the newcomer into the first fitting gap
+        fallback = greedy_schedule(self.K, self.P, [vehicle], self.busy_ports(self.live))
+
+        self.solver.push()
+        self.adding(self.solver, index)
+        window = open_ids + [index]
+        results = [self.results[i] for i in window]
+        for r in results[:-1]:
+            self.solver.add(r['s'] >= now)
+        bill = Sum([r['c'] for r in results])
+        if fallback is not None:
+            seed = [self.plan[i] for i in open_ids] + fallback
+            self.solver.add(bill <= sum(c for *_, c in seed))
+            seeding(self.solver, results, seed)
+        self.solver.minimize(bill)
+        left = self.budget - (time.perf_counter() - started)
+        self.solver.set('timeout', max(1, int(left * 1000)))
+
+        chosen = None
+        outcome = self.solver.check()
+        if self.stats is not None:
+            self.stats.node(len(window))
+            self.stats.count('arrivals:' + str(outcome))
+            adding_z3_statistics(self.stats, z3_statistics(self.solver))
+        if outcome != unsat:
+            try:
+                found = reading_schedule(self.solver.model(), results)
+                if self.checking_window(window, found, now):
+                    chosen = found
+            except Z3Exception:
+                pass
+            if chosen is None and fallback is not None:
+                chosen = [self.plan[i] for i in open_ids] + fallback
+        self.solver.pop()
+
+        if chosen is None:
+            del self.results[index]
+            self.rejected.append(index)
+        else:
+            self.adding(self.solver, index)
+            self.live.append(index)
+            for i, values in zip(window, chosen):
+                self.plan[i] = values
+        self.latencies.append(time.perf_counter() - started)
+        return None if chosen is None else self.plan[index]
+
+    # A model read after a timeout is not guaranteed to satisfy everything,
+    # so it is checked against the charging vehicles before it is used
+    def checking_window(self, window, chosen, now):
+        if any(start < now for _, start, _, _ in chosen[:-1]):
+            return False
+        charging = [i for i in self.live if i in self.frozen]
+        vehicles = [self.vehicles[i] for i in charging + window]
+        return checking_schedule(self.K, self.P, vehicles, [self.plan[i] for i in charging] + chosen)
+
+def running_online(file_name='input.txt', encoding='onehot', budget=ONLINE_BUDGET, stats=None):
+    with timing(stats, 'load'):
+        K, P, vehicle_list = load_data(file_name)
+    station = Online_Station(K, P, encoding, budget)
+    station.stats = stats
+    print(f"Online mode: {len(vehicle_list)} arrivals, {K} ports, {budget:.2f}s per decision")
+    print("-" * 30)
+    for v in sorted(vehicle_list, key=lambda v: v[1]):
+        decision = station.arriving(v)
+        latency = station.latencies[-1]
+        if decision is None:
+            print(f"t={v[1]} Vehicle {v[0]}: rejected | {latency * 1000:.1f} ms")
+        else:
+            p_val, s_val, d_val, c_val = decision
+            print(f"t={v[1]} Vehicle {v[0]}: Port {p_val} | Time {s_val} to {s_val+d_val} "
+                  f"| Cost {c_val} | {latency * 1000:.1f} ms")
+
+    # Plans of open vehicles can still move after their own arrival, so the
+    # final schedule is what actually ran
+    print("-" * 30)
+    accepted = sorted(station.plan, key=lambda i: station.vehicles[i][0])
+    total = sum(station.plan[i][3] for i in accepted)
+    print(f"Accepted: {len(accepted)} | Rejected: {len(station.rejected)} | Total Cost: {total}")
+    if station.latencies:
+        ordered = sorted(station.latencies)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        print(f"Decision latency: mean {sum(ordered) / len(ordered) * 1000:.1f} ms | "
+              f"p95 {p95 * 1000:.1f} ms | max {ordered[-1] * 1000:.1f} ms")
+    if stats is not None:
+        stats.extra.update(accepted=len(accepted), rejected=len(station.rejected), cost=total,
+                           latency_max=max(station.latencies, default=None),
+                           latency_mean=sum(station.latencies) / len(station.latencies)
+                           if station.latencies else None)
+    for i in accepted:
+        p_val, s_val, d_val, c_val = station.plan[i]
+        print(f"Vehicle {station.vehicles[i][0]}: Port {p_val} | Time {s_val} to {s_val+d_val} | Cost {c_val}")
+
+# Builds and solves the same file with every encoding and reports the times
+def comparing_encodings(file_name='input.txt'):
+    K, P, vehicle_list = load_data(file_name)
+    print(f"{len(vehicle_list)} vehicles, {K} ports")
+    for encoding in ENCODINGS:
+        started = time.perf_counter()
+        solver, results, total_bill, pairs, _ = building_model(K, P, vehicle_list, encoding)
+        built = time.perf_counter()
+        outcome = solver.check()
+        solved = time.perf_counter()
+        cost = solver.model().eval(total_bill) if outcome == sat else outcome
+        print(f"{encoding:>7}: cost {cost} | build {built - started:.3f}s | solve {solved - built:.3f}s")
+
+def main(stats=None):
+    # python assg04.py [input_file] [--encoding int|onehot] [--compare]
+    #                  [--workers n] [--monolithic] [--timeout seconds] [--no-warm-start]
+    #                  [--online [--budget seconds]]
+    #                  [--stats [file]] [--progress [n]] [--profile]
+    valued = {'--encoding', '--workers', '--timeout', '--budget', '--stats', '--progress'}
+    positional = [arg for k, arg in enumerate(sys.argv[1:], 1)
+                  if not arg.startswith('--') and sys.argv[k - 1] not in valued]
+    file_name = positional[0] if positional else 'input.txt'
+    if '--compare' in sys.argv:
+        comparing_encodings(file_name)
+    elif '--online' in sys.argv:
+        running_online(file_name, reading_option('--encoding', 'onehot'),
+                       float(reading_option('--budget', ONLINE_BUDGET)), stats)
+    else:
+        # Under a time limit the one-hot model reaches a first schedule
+        # sooner when the greedy start finds none, so it is the default there
+        timeout = reading_option('--timeout')
+        run_scheduler(file_name, reading_option('--encoding', 'int' if timeout is None else 'onehot'),
+                      int(reading_option('--workers', 1)), '--monolithic' in sys.argv,
+                      None if timeout is None else float(timeout), '--no-warm-start' not in sys.argv,
+                      stats)
 
 if __name__ == "__main__":
-    run_scheduler()
\ No newline at end of file
+    running_with_stats('assg04', main)
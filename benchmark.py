@@ -0,0 +1,233 @@
+import os
+import sys
+import json
+import math
+import importlib
+import time
+import platform
+import resource
+import subprocess
+
+import genTestcases
+from run_stats import Run_Stats, reading_option
+
+# Benchmark ladders for the four schedulers. Every instance is generated
+# from a fixed seed, so two runs of the same ladder solve the same files and
+# their records can be compared key by key (solver, size).
+#
+# Each run happens in a child process of its own: peak RSS is then the
+# child's own high-water mark, and one slow or crashing run cannot take the
+# rest of the ladder with it. A record holds
+#   wall_time  - best of --repeat runs, in seconds, setup and parsing included
+#   nodes      - search states expanded (memo misses for assg01, search
+#                nodes for assg02, A* nodes for assg03, Z3 decisions for assg04)
+#   memo_size  - entries left in the memo table at the end (null if none)
+#   peak_rss_kb, answer, status ('ok', 'timeout' or 'error')
+
+LADDERS = {
+    'assg01': {'sizes': [8, 12, 16, 20],
+               'instance': {'shape': 'random', 'students': 2, 'capacity': 5, 'max_cost': 3,
+                            'width': 4, 'fan_in': 1},
+               'days_per_task': 0.25},
+    'assg02': {'sizes': [16, 24, 32, 40],
+               'instance': {'shape': 'layered', 'students': 2, 'capacity': 5, 'max_cost': 5,
+                            'width': 4, 'fan_in': 2},
+               'deadline_per_task': 0.3},
+    'assg03': {'sizes': [10, 16, 22, 28],
+               'instance': {'shape': 'layered', 'students': 1, 'capacity': 5, 'max_cost': 5,
+                            'width': 4, 'fan_in': 2},
+               'prices': (10, 15), 'limits': (3, 3), 'deadline_per_task': 1.0},
+    'assg04': {'sizes': [10, 20, 40],
+               'instance': {'ports': 5, 'load': 0.1},
+               'encoding': 'onehot'},
+}
+
+def instance_path(workdir, solver, size, seed):
+    return os.path.join(workdir, f"{solver}.{size}.seed{seed}.txt")
+
+def preparing_instance(workdir, solver, size, seed):
+    path = instance_path(workdir, solver, size, seed)
+    if not os.path.exists(path):
+        settings = LADDERS[solver]['instance']
+        if solver == 'assg04':
+            genTestcases.create_ev_instance(path, size, settings['ports'], settings['load'], seed)
+        else:
+            genTestcases.create_task_instance(path, size, settings['shape'], seed, settings['students'],
+                                              settings['capacity'], settings['max_cost'], settings['width'],
+                                              fan_in=settings['fan_in'], title=f"{solver} benchmark")
+    return path
+
+# One measured run per solver, in-process. Returns (answer, nodes, memo_size)
+def measuring_assg01(path, size):
+    from bulk_loader import loading_task_graph
+    from assg01 import Schedule_Optimizer
+    headers, graph = loading_task_graph(path)
+    days = max(1, round(size * LADDERS['assg01']['days_per_task']))
+    engine = Schedule_Optimizer(headers['N'], headers['K'], days, graph)
+    count = engine.counting_completions()
+    memo = engine.completion_counts
+    return count, memo.misses, len(memo)
+
+def measuring_assg02(path, size):
+    from bulk_loader import loading_task_graph
+    from transposition_table import Transposition_Table
+    from assg02 import Feasibility_Oracle, earliest_completion, minimum_subscription
+    headers, graph = loading_task_graph(path)
+    dead_states = Transposition_Table()
+    stats = Run_Stats('assg02')
+    oracle = Feasibility_Oracle(graph, dead_states=dead_states, stats=stats)
+    N, K = headers['N'], headers['K']
+    deadline = max(1, round(size * LADDERS['assg02']['deadline_per_task']))
+    answer = [earliest_completion(graph, N, K, False, oracle),
+              minimum_subscription(graph, N, deadline, False, oracle)]
+    return answer, stats.nodes, len(dead_states)
+
+def measuring_assg03(path, size):
+    from assg03 import (parse_input_file, generate_schedule, cheapest_subscription,
+                        Day_Search_Space, astar_search)
+    ladder = LADDERS['assg03']
+    (c1, c2), (cg, gm) = ladder['prices'], ladder['limits']
+    graph = parse_input_file(path)
+    answer = []
+    nodes = 0
+    for case_type in ('A', 'B'):
+        days, _, _ = generate_schedule(graph, cg, gm, case_type)
+        deadline = max(1, round(size * ladder['deadline_per_task']))
+        best_cost, _ = cheapest_subscription(graph, c1, c2, cg, gm, deadline, case_type)
+        nodes += astar_search(Day_Search_Space(graph, cg, gm, case_type)).expanded
+        # No subscription meets the deadline: inf, which JSON cannot hold
+        answer.append([days, None if best_cost == math.inf else best_cost])
+    return answer, nodes, None
+
+def measuring_assg04(path, size):
+    from assg04 import load_data, overlapping_pairs, overlap_components, solving_components
+    K, P, vehicle_list = load_data(path)
+    components = overlap_components(len(vehicle_list), overlapping_pairs(vehicle_list))
+    stats = Run_Stats('assg04')
+    status, _, total, _ = solving_components(K, P, vehicle_list, components, LADDERS['assg04']['encoding'],
+                                             stats=stats)
+    return [status, total], stats.counters['z3:decisions'], None
+
+MEASURES = {'assg01': measuring_assg01, 'assg02': measuring_assg02,
+            'assg03': measuring_assg03, 'assg04': measuring_assg04}
+
+def running_one(solver, path, size):
+    # Child side: measure, then print one JSON record on the last line.
+    # Imports happen before the clock starts (Z3 and NumPy alone take a
+    # good part of a small run)
+    importlib.import_module(solver)
+    importlib.import_module('bulk_loader')
+    started = time.perf_counter()
+    answer, nodes, memo_size = MEASURES[solver](path, size)
+    record = {'wall_time': time.perf_counter() - started, 'nodes': nodes, 'memo_size': memo_size,
+              'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 'answer': answer}
+    print(json.dumps(record))
+
+def measuring(solver, path, size, repeat, run_timeout):
+    record = {'solver': solver, 'size': size, 'instance': os.path.basename(path)}
+    runs = []
+    for _ in range(repeat):
+        try:
+            done = subprocess.run([sys.executable, os.path.abspath(__file__), '--one', solver, path, str(size)],
+                                  capture_output=True, text=True, timeout=run_timeout)
+        except subprocess.TimeoutExpired:
+            record.update(status='timeout', wall_time=None)
+            return record
+        if done.returncode != 0:
+            record.update(status='error', wall_time=None, error=done.stderr.strip().splitlines()[-1:])
+            return record
+        runs.append(json.loads(done.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run['wall_time'])
+    record.update(status='ok', **best)
+    record['peak_rss_kb'] = max(run['peak_rss_kb'] for run in runs)
+    return record
+
+def running_ladders(solvers, seed, workdir, repeat, run_timeout):
+    os.makedirs(workdir, exist_ok=True)
+    records = []
+    for solver in solvers:
+        for size in LADDERS[solver]['sizes']:
+            path = preparing_instance(workdir, solver, size, seed)
+            record = measuring(solver, path, size, repeat, run_timeout)
+            records.append(record)
+            wall = 'n/a' if record['wall_time'] is None else f"{record['wall_time']:.3f}s"
+            print(f"{solver} size {size:>4}: {record['status']:>7} | {wall:>9} | nodes {record.get('nodes')} "
+                  f"| memo {record.get('memo_size')} | rss {record.get('peak_rss_kb')} KB", flush=True)
+            if record['status'] == 'timeout':
+                # The rest of the ladder is only bigger
+                break
+    return {'meta': {'seed': seed, 'repeat': repeat, 'python': platform.python_version(),
+                     'machine': platform.machine(), 'created': time.strftime('%Y-%m-%d %H:%M:%S')},
+            'ladders': LADDERS, 'runs': records}
+
+# Compares against a stored run: a size is slower (or faster) when its wall
+# time moved by more than `tolerance` of the baseline and by more than
+# `floor` seconds, so timer noise on tiny runs is not reported. A different
+# answer is always reported. Returns the number of regressions.
+def comparing(results, baseline, tolerance=0.25, floor=0.05):
+    before = {(run['solver'], run['size']): run for run in baseline['runs']}
+    if baseline['meta'].get('seed') != results['meta']['seed']:
+        print("Warning: the baseline was generated with another seed; the instances differ.")
+    regressions = 0
+    print("\nsolver   size   baseline      now   ratio  verdict")
+    for run in results['runs']:
+        old = before.get((run['solver'], run['size']))
+        if old is None or old['status'] != 'ok' or run['status'] != 'ok':
+            verdict = 'no baseline' if old is None else f"{old['status']} -> {run['status']}"
+            if old is not None and old['status'] == 'ok' and run['status'] != 'ok':
+                regressions += 1
+            print(f"{run['solver']:<8} {run['size']:>4}  {'':>9} {'':>8} {'':>7}  {verdict}")
+            continue
+        ratio = run['wall_time'] / old['wall_time'] if old['wall_time'] else float('inf')
+        moved = abs(run['wall_time'] - old['wall_time']) > floor
+        if run['answer'] != old['answer']:
+            verdict = f"ANSWER CHANGED {old['answer']} -> {run['answer']}"
+            regressions += 1
+        elif moved and ratio > 1 + tolerance:
+            verdict = 'SLOWER'
+            regressions += 1
+        elif moved and ratio < 1 - tolerance:
+            verdict = 'faster'
+        else:
+            verdict = 'same'
+        print(f"{run['solver']:<8} {run['size']:>4}  {old['wall_time']:>8.3f}s {run['wall_time']:>7.3f}s "
+              f"{ratio:>6.2f}x  {verdict}")
+    return regressions
+
+if __name__ == "__main__":
+    # python benchmark.py [--only assg01,assg03] [--seed s] [--repeat r] [--workdir dir]
+    #                     [--run-timeout seconds] [--out results.json]
+    #                     [--baseline base.json [--update-baseline] [--tolerance 0.25]]
+    if '--one' in sys.argv:
+        position = sys.argv.index('--one')
+        running_one(sys.argv[position + 1], sys.argv[position + 2], int(sys.argv[position + 3]))
+        sys.exit(0)
+
+    only = reading_option('--only')
+    solvers = list(LADDERS) if only is None else only.split(',')
+    unknown = [solver for solver in solvers if solver not in LADDERS]
+    if unknown:
+        print(f"Unknown solver: {', '.join(unknown)} (expected {', '.join(LADDERS)})")
+        sys.exit(2)
+
+    results = running_ladders(solvers, int(reading_option('--seed', 1)),
+                              reading_option('--workdir', 'bench_instances'),
+                              int(reading_option('--repeat', 1)), float(reading_option('--run-timeout', 300)))
+    out = reading_option('--out', 'bench_results.json')
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"Results written to {out}")
+
+    baseline_path = reading_option('--baseline')
+    if baseline_path is None:
+        sys.exit(0)
+    if '--update-baseline' in sys.argv or not os.path.exists(baseline_path):
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f"Baseline stored in {baseline_path}")
+        sys.exit(0)
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = comparing(results, baseline, float(reading_option('--tolerance', 0.25)))
+    print(f"\n{regressions} regression(s) against {baseline_path}")
+    sys.exit(1 if regressions else 0)
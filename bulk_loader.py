@@ -0,0 +1,277 @@
+import os
+import mmap
+from array import array
+
+from task_graph import Task_Graph, reading_task_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bulk readers for the task files (assg01-03) and the EV files (assg04).
+#
+# The whole file is mapped and tokenized with NumPy straight from the bytes:
+# token bounds, comment lines and integer values all come from array
+# operations, with no per-line Python work. The parsed result is saved next
+# to the source as <file>.<kind>.cache.npy, a flat int64 array whose header
+# carries the source size and mtime; later runs memory-map it and skip the
+# parse. For task files the cache holds the finished Task_Graph arrays
+# (CSR lists, Kahn order, levels, tails), so a cached load does no graph
+# work either.
+#
+# Anything the fast path does not understand (non-numeric or zero-padded
+# labels, repeated task lines, no NumPy) falls back to the line parsers,
+# without a cache.
+
+CACHE_MAGIC = 0x7461736b63616368
+CACHE_VERSION = 1
+GRAPH_STR_KIND = 1
+GRAPH_INT_KIND = 2
+EV_KIND = 3
+CACHE_NAMES = {GRAPH_STR_KIND: 'graph-str', GRAPH_INT_KIND: 'graph-int', EV_KIND: 'ev'}
+HEADER_SIZE = 5
+MAX_DIGITS = 18
+
+
+def cache_path_for(path, kind):
+    return f"{path}.{CACHE_NAMES[kind]}.cache.npy"
+
+
+def tokenizing(path):
+    # Returns (codes, starts, values) or None:
+    #   codes  - the letter starting each content line (A, N, K, P, V ...)
+    #   starts - where each line's integers begin in values
+    #   values - every other token as int64, in file order
+    # None means the file is not in the plain "letter then integers" shape.
+    with open(path, 'rb') as source:
+        if os.fstat(source.fileno()).st_size == 0:
+            data = b''
+        else:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = mapped[:]
+    if data.startswith(b'\xef\xbb\xbf'):
+        data = data[3:]
+    buf = np.frombuffer(data, dtype=np.uint8)
+    space = buf <= 32
+    line_of = np.cumsum(buf == 10)
+
+    # A line whose first visible byte is '%' is a comment.
+    visible = np.flatnonzero(~space)
+    lines, first = np.unique(line_of[visible], return_index=True)
+    comment_lines = lines[buf[visible[first]] == ord('%')]
+    if len(comment_lines):
+        space = space | np.isin(line_of, comment_lines)
+
+    edge = np.diff(np.concatenate(([1], space.view(np.int8), [1])))
+    tok_start = np.flatnonzero(edge == -1)
+    tok_end = np.flatnonzero(edge == 1)
+    if not len(tok_start):
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros(0, dtype=np.uint8), empty, empty
+    lengths = tok_end - tok_start
+    first_byte = buf[tok_start]
+    letter = first_byte | 32
+    is_marker = (letter >= ord('a')) & (letter <= ord('z'))
+
+    # Each line is one marker letter followed by integers only.
+    tok_line = line_of[tok_start]
+    first_on_line = np.concatenate(([True], tok_line[1:] != tok_line[:-1]))
+    if (first_on_line != is_marker).any() or (lengths[is_marker] != 1).any():
+        return None
+
+    number = ~is_marker
+    num_start = tok_start[number]
+    num_len = lengths[number]
+    if (num_len > MAX_DIGITS).any() or ((buf[num_start] == ord('0')) & (num_len > 1)).any():
+        return None
+    byte_at = np.repeat(num_start - np.concatenate(([0], np.cumsum(num_len)[:-1])), num_len) \
+        + np.arange(int(num_len.sum()))
+    digits = buf[byte_at].astype(np.int64) - ord('0')
+    if ((digits < 0) | (digits > 9)).any():
+        return None
+    power = np.repeat(num_start + num_len - 1, num_len) - byte_at
+    values = np.add.reduceat(digits * np.power(10, power, dtype=np.int64),
+                             np.concatenate(([0], np.cumsum(num_len)[:-1])))
+
+    markers = np.flatnonzero(is_marker)
+    return first_byte[is_marker], markers - np.arange(len(markers)), values
+
+
+def loading_cache(path, kind):
+    cache = cache_path_for(path, kind)
+    try:
+        stat = os.stat(path)
+        table = np.load(cache, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if (table.ndim != 1 or len(table) < HEADER_SIZE or table[0] != CACHE_MAGIC or table[1] != CACHE_VERSION
+            or table[2] != kind or table[3] != stat.st_size or table[4] != stat.st_mtime_ns):
+        return None
+    return table[HEADER_SIZE:]
+
+
+def saving_cache(path, kind, parts):
+    stat = os.stat(path)
+    head = np.array([CACHE_MAGIC, CACHE_VERSION, kind, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    cache = cache_path_for(path, kind)
+    scratch = cache + '.tmp.npy'
+    try:
+        np.save(scratch, np.concatenate([head] + [np.asarray(p, dtype=np.int64).reshape(-1) for p in parts]))
+        os.replace(scratch, cache)
+    except OSError:
+        # A read-only input directory only costs the cache.
+        pass
+
+
+def building_graph(labels, costs, owners, deps, label_type):
+    # Vectorized Task_Graph construction: labels/costs per task line,
+    # (owners[i], deps[i]) one per dependency token in file order. Same
+    # graph as Task_Graph(entries), or None when some label repeats.
+    T = len(labels)
+    by_value = np.argsort(labels, kind='stable')
+    sorted_values = labels[by_value]
+    if T and (sorted_values[1:] == sorted_values[:-1]).any():
+        return None
+    # Dense ids follow label order as label_type compares them.
+    key = labels.astype(str) if label_type is str else labels
+    perm = np.argsort(key, kind='stable')
+    rank = np.empty(T, dtype=np.int64)
+    rank[perm] = np.arange(T)
+
+    at = np.searchsorted(sorted_values, deps)
+    at_clipped = np.minimum(at, max(T - 1, 0))
+    found = (at < T) & (sorted_values[at_clipped] == deps) if T else np.zeros(len(deps), bool)
+    owner_ids = rank[owners]
+    dep_ids = rank[by_value[at_clipped[found]]] if T else np.zeros(0, np.int64)
+
+    # Repeated dependencies count once, in first-seen order.
+    inside_owner = owner_ids[found]
+    pair = inside_owner * max(T, 1) + dep_ids
+    _, first_seen = np.unique(pair, return_index=True)
+    first_seen.sort()
+    inside_owner, dep_ids = inside_owner[first_seen], dep_ids[first_seen]
+    outside = np.unique(np.stack([owner_ids[~found], deps[~found]], axis=1), axis=0)
+    missing = np.bincount(outside[:, 0], minlength=T) if len(outside) else np.zeros(T, np.int64)
+
+    by_owner = np.argsort(inside_owner, kind='stable')
+    pred_ids = dep_ids[by_owner]
+    pred_start = np.concatenate(([0], np.cumsum(np.bincount(inside_owner, minlength=T))))
+    by_dep = np.lexsort((inside_owner, dep_ids))
+    succ_ids = inside_owner[by_dep]
+    succ_start = np.concatenate(([0], np.cumsum(np.bincount(dep_ids, minlength=T))))
+
+    return Task_Graph.from_csr(
+        [label_type(x) for x in labels[perm].tolist()], costs[perm].tolist(), missing.tolist(),
+        pred_start.tolist(), pred_ids.tolist(), succ_start.tolist(), succ_ids.tolist())
+
+
+def loading_task_graph(path, label_type=str, use_cache=True):
+    # Same result as task_graph.reading_task_file: (headers, Task_Graph).
+    # Cache body: H, T, E, O, then H (letter, value) pairs, T labels, T
+    # costs, T missing, T + 1 pred_start, E pred_ids, T + 1 succ_start,
+    # E succ_ids, O order, T levels, T tails.
+    if np is None:
+        return reading_task_file(path, label_type)
+    kind = GRAPH_STR_KIND if label_type is str else GRAPH_INT_KIND
+    body = loading_cache(path, kind) if use_cache else None
+    if body is not None:
+        H, T, E, O = (int(x) for x in body[:4])
+        sizes = [2 * H, T, T, T, T + 1, E, T + 1, E, O, T, T]
+        offsets = np.concatenate(([4], 4 + np.cumsum(sizes)))
+        part = [body[offsets[i]:offsets[i + 1]] for i in range(len(sizes))]
+        pairs = part[0].tolist()
+        headers = {chr(pairs[i]): pairs[i + 1] for i in range(0, len(pairs), 2)}
+        native = np.dtype(f"i{array('l').itemsize}")
+        as_array = [array('l', p.astype(native).tobytes()) for p in part[3:]]
+        graph = Task_Graph.from_csr([label_type(x) for x in part[1].tolist()], part[2].tolist(),
+                                    *as_array)
+        return headers, graph
+
+    split = tokenizing(path)
+    if split is None:
+        return reading_task_file(path, label_type)
+    codes, starts, values = split
+    ends = np.append(starts[1:], len(values))
+
+    is_task = codes == ord('A')
+    task_start, task_end = starts[is_task], ends[is_task]
+    if (task_end - task_start < 2).any():
+        return reading_task_file(path, label_type)
+    is_header = ~is_task & (ends - starts == 1)
+    header_pairs = np.stack([codes[is_header].astype(np.int64), values[starts[is_header]]], axis=1)
+    headers = {chr(c): v for c, v in header_pairs.tolist()}
+
+    # Dependencies are everything after the cost; the 0 terminator (and
+    # any other 0) is not a task.
+    dep_count = task_end - task_start - 2
+    owners = np.repeat(np.arange(len(task_start)), dep_count)
+    dep_at = np.repeat(task_start + 2 - np.concatenate(([0], np.cumsum(dep_count)[:-1])), dep_count) \
+        + np.arange(int(dep_count.sum()))
+    deps = values[dep_at]
+    keep = deps != 0
+    graph = building_graph(values[task_start], values[task_start + 1], owners[keep], deps[keep], label_type)
+    if graph is None:
+        return reading_task_file(path, label_type)
+
+    if use_cache:
+        labels = np.array([int(x) for x in graph.labels], dtype=np.int64)
+        saving_cache(path, kind, [
+            [len(headers), len(graph), len(graph.pred_ids), len(graph.order)], header_pairs,
+            labels, graph.costs, graph.missing, graph.pred_start, graph.pred_ids,
+            graph.succ_start, graph.succ_ids, graph.order, graph.levels, graph.tails])
+    return headers, graph
+
+
+def reading_ev_file(file_name):
+    # Line-by-line reader for the EV format: 'K <ports>', 'P <prices...>'
+    # and 'V <id> <arrival> <departure> <work>'.
+    ports_count = 0
+    prices = []
+    vehicles = []
+    with open(file_name, 'r') as f:
+        for line in f:
+            if line.startswith('%') or not line.strip():
+                continue
+            parts = line.split()
+            if parts[0] == 'K':
+                ports_count = int(parts[1])
+            elif parts[0] == 'P':
+                prices = [int(p) for p in parts[1:]]
+            elif parts[0] == 'V':
+                vehicles.append([int(x) for x in parts[1:]])
+    return ports_count, prices, vehicles
+
+
+def loading_ev_instance(path, use_cache=True):
+    # Same result as reading_ev_file: (ports_count, prices, vehicles).
+    # Cache body: K, price count, prices, then 4 values per vehicle.
+    if np is None:
+        return reading_ev_file(path)
+    body = loading_cache(path, EV_KIND) if use_cache else None
+    if body is None:
+        split = tokenizing(path)
+        if split is None:
+            return reading_ev_file(path)
+        codes, starts, values = split
+        ends = np.append(starts[1:], len(values))
+
+        ports = np.flatnonzero(codes == ord('K'))
+        price_lines = np.flatnonzero(codes == ord('P'))
+        is_vehicle = codes == ord('V')
+        if (ends[is_vehicle] - starts[is_vehicle] != 4).any():
+            return reading_ev_file(path)
+        # Later K and P lines override earlier ones, as in the line reader.
+        ports_count = int(values[starts[ports[-1]]]) if len(ports) else 0
+        prices = values[starts[price_lines[-1]]:ends[price_lines[-1]]] if len(price_lines) else values[:0]
+        vehicles = values[starts[is_vehicle][:, None] + np.arange(4)]
+
+        body = np.concatenate([[ports_count, len(prices)], prices, vehicles.reshape(-1)]).astype(np.int64)
+        if use_cache:
+            saving_cache(path, EV_KIND, [body])
+
+    ports_count, price_count = int(body[0]), int(body[1])
+    prices = body[2:2 + price_count].tolist()
+    flat = body[2 + price_count:].tolist()
+    vehicles = [flat[i:i + 4] for i in range(0, len(flat), 4)]
+    return ports_count, prices, vehicles
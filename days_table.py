@@ -0,0 +1,108 @@
+import os
+import hashlib
+
+import numpy as np
+
+from assg03 import generate_schedule
+
+# Completion days for every (cg, gm) subscription of one instance and case.
+# Days depend only on the limits and the case, never on prices or the
+# deadline, so one table answers any number of (c1, c2, m) scenarios.
+#
+# days[cg, gm] is the finish day with cg ChatGPT and gm Gemini prompts/day,
+# or -1 when that subscription never finishes. Row and column 0 are -1 so
+# the limits index the table directly.
+
+NO_FINISH = -1
+
+
+def completion_days_table(graph,
+                          chatgpt_limit, gemini_limit,
+                          case_type):
+    days = np.full((chatgpt_limit + 1, gemini_limit + 1), NO_FINISH, dtype=np.int64)
+    for cg in range(1, chatgpt_limit + 1):
+        for gm in range(1, gemini_limit + 1):
+            d, _, _ = generate_schedule(graph, cg, gm, case_type)
+            if d is not None:
+                days[cg, gm] = d
+    return days
+
+
+def days_table_path(input_file, case_type, chatgpt_limit, gemini_limit):
+    # The file content is part of the name, so editing the instance never
+    # picks up a stale table.
+    with open(input_file, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:16]
+    stem = os.path.splitext(input_file)[0]
+    return f"{stem}.{case_type}.{chatgpt_limit}x{gemini_limit}.{digest}.days.npy"
+
+
+def loading_days_table(input_file, graph,
+                       chatgpt_limit, gemini_limit,
+                       case_type):
+    path = days_table_path(input_file, case_type, chatgpt_limit, gemini_limit)
+    if os.path.exists(path):
+        days = np.load(path)
+        if days.shape == (chatgpt_limit + 1, gemini_limit + 1):
+            return days
+
+    days = completion_days_table(graph,
+                                 chatgpt_limit, gemini_limit,
+                                 case_type)
+    np.save(path, days)
+    return days
+
+
+def cheapest_for_scenarios(days, c1, c2, m):
+    # For each scenario i pick the cheapest (cg, gm) with days <= m[i].
+    # Ties go to the lexicographically smallest pair, as the full grid scan
+    # in run_case does. Returns (cg, gm, daily_cost) arrays; all three are -1
+    # when no subscription meets the deadline.
+    #
+    # With non-negative prices, the cheapest pair for a fixed cg uses the
+    # smallest gm that meets the deadline. So each distinct deadline shrinks
+    # the table to one candidate per cg, and a scenario is an argmin over cg.
+    c1, c2, m = np.broadcast_arrays(np.atleast_1d(np.asarray(c1, dtype=np.int64)),
+                                    np.atleast_1d(np.asarray(c2, dtype=np.int64)),
+                                    np.atleast_1d(np.asarray(m, dtype=np.int64)))
+    if (c1 < 0).any() or (c2 < 0).any():
+        raise ValueError("prompt prices must be non-negative")
+
+    count = c1.shape[0]
+    best_cg = np.full(count, -1, dtype=np.int64)
+    best_gm = np.full(count, -1, dtype=np.int64)
+    best_cost = np.full(count, -1, dtype=np.int64)
+
+    cg_axis = np.arange(days.shape[0], dtype=np.int64)
+    finishes = days != NO_FINISH
+    deadlines, groups = np.unique(m, return_inverse=True)
+
+    for g, deadline in enumerate(deadlines):
+        allowed = finishes & (days <= deadline)
+        has_gm = allowed.any(axis=1)
+        if not has_gm.any():
+            continue
+        min_gm = allowed.argmax(axis=1)
+
+        members = np.nonzero(groups == g)[0]
+        cost = cg_axis[None, :] * c1[members, None] + min_gm[None, :] * c2[members, None]
+        cost = np.where(has_gm[None, :], cost, np.iinfo(np.int64).max)
+        pick = cost.argmin(axis=1)
+
+        best_cg[members] = pick
+        best_gm[members] = min_gm[pick]
+        best_cost[members] = cost[np.arange(len(members)), pick]
+
+    return best_cg, best_gm, best_cost
+
+
+def reading_scenarios(filename):
+    # One scenario per line: c1 c2 m. Lines starting with % are comments.
+    scenarios = []
+    with open(filename, "r") as file:
+        for line in file:
+            parts = line.strip().split()
+            if not parts or parts[0].startswith('%'):
+                continue
+            scenarios.append(tuple(int(x) for x in parts[:3]))
+    return scenarios
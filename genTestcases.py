@@ -1,44 +1,138 @@
+import sys
 import random
 import math
+from run_stats import reading_option
 
 # This function creates a random test case for the EV charging problem
-def create_random_input(filename="input.txt"):
+def create_random_input(filename="input.txt", seed=None):
+    rng = random.Random(seed)
+
     # Randomly decide number of ports (e.g., between 3 and 6)
-    total_ports = random.randint(3, 6)
-    
+    total_ports = rng.randint(3, 6)
+
     # Generate prices that increase as the port gets faster
-    current_price = random.randint(5, 10)
-    prices = []
-    for i in range(total_ports):
-        prices.append(current_price)
-        current_price += random.randint(4, 10) # Price goes up for faster ports
-        
+    prices = rising_prices(rng, total_ports)
+
     # Decide how many vehicles are in the system
-    total_vehicles = random.randint(5, 10)
-    
+    total_vehicles = rng.randint(5, 10)
+
     # Write everything to the file in the required format
     with open(filename, 'w') as my_file:
-        my_file.write(f"% total number of ports\n")
-        my_file.write(f"K {total_ports}\n")
-        
-        my_file.write(f"% prices for each port\n")
-        price_string = " ".join(map(str, prices))
-        my_file.write(f"P {price_string}\n")
-        
-        my_file.write(f"% id arrival departure work\n")
+        writing_ev_header(my_file, total_ports, prices)
         for i in range(1, total_vehicles + 1):
-            arrival = random.randint(0, 50)
-            work = random.randint(10, 30)
-            
+            arrival = rng.randint(0, 50)
+            work = rng.randint(10, 30)
+
             # The departure must be late enough to allow charging at some port
             # Even at the fastest port, duration is ceil(work/total_ports)
             min_duration = math.ceil(work / total_ports)
-            extra_time = random.randint(min_duration, work + 5)
+            extra_time = rng.randint(min_duration, work + 5)
             departure = arrival + extra_time
-            
+
             my_file.write(f"V {i} {arrival} {departure} {work}\n")
 
     print(f"File '{filename}' has been generated successfully!")
 
+def rising_prices(rng, total_ports):
+    current_price = rng.randint(5, 10)
+    prices = []
+    for i in range(total_ports):
+        prices.append(current_price)
+        current_price += rng.randint(4, 10) # Price goes up for faster ports
+    return prices
+
+def writing_ev_header(my_file, total_ports, prices):
+    my_file.write(f"% total number of ports\n")
+    my_file.write(f"K {total_ports}\n")
+
+    my_file.write(f"% prices for each port\n")
+    price_string = " ".join(map(str, prices))
+    my_file.write(f"P {price_string}\n")
+
+    my_file.write(f"% id arrival departure work\n")
+
+# EV instance of any size. The load factor is the total work over what the
+# station can charge in the whole span (port k charges k units per step, so
+# K ports give K(K+1)/2 units per step): around 1 and above the ports are
+# saturated, small values leave them mostly idle. Lines are written as they
+# are drawn, so millions of vehicles never sit in memory.
+def create_ev_instance(filename, vehicles, ports=5, load=0.6, seed=None, min_work=10, max_work=30):
+    rng = random.Random(seed)
+    prices = rising_prices(rng, ports)
+    capacity = ports * (ports + 1) // 2
+    mean_work = (min_work + max_work) / 2
+    span = max(1, round(vehicles * mean_work / (capacity * load)))
+
+    with open(filename, 'w') as my_file:
+        my_file.write(f"% seed {seed} | {vehicles} vehicles | load {load}\n")
+        writing_ev_header(my_file, ports, prices)
+        for i in range(1, vehicles + 1):
+            arrival = rng.randrange(span)
+            work = rng.randint(min_work, max_work)
+            min_duration = math.ceil(work / ports)
+            departure = arrival + rng.randint(min_duration, work + 5)
+            my_file.write(f"V {i} {arrival} {departure} {work}\n")
+
+# Dependency shapes for the task files (assg01-03). Task i (1-based) only
+# ever depends on lower ids, so every shape is acyclic and ids are already in
+# topological order.
+#   chain   - i depends on i-1
+#   wide    - no dependencies at all
+#   layered - layers of `width` tasks, each task depends on `fan_in` random
+#             tasks of the layer before
+#   random  - each task depends on up to `fan_in` random tasks among the
+#             `width` ids before it
+DAG_SHAPES = ('chain', 'wide', 'layered', 'random')
+
+def drawing_dependencies(rng, shape, i, width, fan_in):
+    if shape == 'chain':
+        return [i - 1] if i > 1 else []
+    if shape == 'wide':
+        return []
+    if shape == 'layered':
+        layer_start = (i - 1) // width * width + 1
+        if layer_start == 1:
+            return []
+        below = range(layer_start - width, layer_start)
+    else:
+        below = range(max(1, i - width), i)
+    return sorted(rng.sample(below, min(fan_in, len(below))))
+
+def create_task_instance(filename, tasks, shape='random', seed=None, students=2, capacity=5,
+                         max_cost=None, width=10, fan_in=2, title=None):
+    if shape not in DAG_SHAPES:
+        raise ValueError(f"unknown shape: {shape} (expected one of {', '.join(DAG_SHAPES)})")
+    rng = random.Random(seed)
+    max_cost = capacity if max_cost is None else max_cost
+
+    with open(filename, 'w') as my_file:
+        my_file.write(f"% {title or shape} | seed {seed} | {tasks} tasks\n")
+        my_file.write(f"N {students}\n")
+        my_file.write(f"K {capacity}\n")
+        for i in range(1, tasks + 1):
+            deps = drawing_dependencies(rng, shape, i, width, fan_in)
+            line = " ".join(map(str, [i, rng.randint(1, max_cost)] + deps + [0]))
+            my_file.write(f"A {line}\n")
+
 if __name__ == "__main__":
-    create_random_input()
\ No newline at end of file
+    # python genTestcases.py                              (small EV file, input.txt)
+    # python genTestcases.py ev <file> [--vehicles n] [--ports k] [--load f] [--seed s]
+    # python genTestcases.py dag <file> [--tasks n] [--shape chain|wide|layered|random]
+    #                        [--width w] [--fan-in f] [--students n] [--capacity k]
+    #                        [--max-cost c] [--seed s]
+    seed = reading_option('--seed')
+    seed = None if seed is None else int(seed)
+    if len(sys.argv) < 3 or sys.argv[1] not in ('ev', 'dag'):
+        create_random_input(seed=seed)
+    elif sys.argv[1] == 'ev':
+        create_ev_instance(sys.argv[2], int(reading_option('--vehicles', 10)),
+                           int(reading_option('--ports', 5)), float(reading_option('--load', 0.6)), seed)
+        print(f"File '{sys.argv[2]}' has been generated successfully!")
+    else:
+        max_cost = reading_option('--max-cost')
+        create_task_instance(sys.argv[2], int(reading_option('--tasks', 10)),
+                             reading_option('--shape', 'random'), seed,
+                             int(reading_option('--students', 2)), int(reading_option('--capacity', 5)),
+                             None if max_cost is None else int(max_cost),
+                             int(reading_option('--width', 10)), int(reading_option('--fan-in', 2)))
+        print(f"File '{sys.argv[2]}' has been generated successfully!")
@@ -0,0 +1,170 @@
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Counters, timers and progress hooks shared by the schedulers.
+#
+# A solver keeps a `stats` attribute that stays None unless the run asked
+# for stats, and every hot-path update sits behind `if stats is not None`,
+# so a plain run pays one test per node and nothing more. At the end of the
+# run the whole thing becomes one flat JSON record (record / emitting).
+#
+#   node(depth)   - one expanded search node; feeds the depth histogram and
+#                   calls progress(stats) every `every` nodes
+#   count(name)   - any named event, e.g. "prune:capacity"
+#   phase(name)   - context manager adding wall time to a named phase
+#   table(name, t)- memo table whose hit rate goes into the record
+#   adding(prefix, values) - numeric statistics from elsewhere (Z3)
+
+PROGRESS_EVERY = 100000
+
+class Run_Stats:
+    def __init__(self, label, progress=None, every=PROGRESS_EVERY):
+        self.label = label
+        self.progress = progress
+        self.every = every
+        self.next_report = every
+        self.nodes = 0
+        self.depths = Counter()
+        self.counters = Counter()
+        self.phases = {}
+        self.tables = {}
+        self.extra = {}
+        self.started = time.perf_counter()
+
+    def node(self, depth):
+        self.nodes += 1
+        self.depths[depth] += 1
+        if self.nodes >= self.next_report:
+            self.next_report += self.every
+            if self.progress is not None:
+                self.progress(self)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def table(self, name, table):
+        self.tables[name] = table
+
+    def adding(self, prefix, values):
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                self.counters[prefix + key] += value
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def record(self):
+        memo = {}
+        for name, table in self.tables.items():
+            figures = table.stats()
+            lookups = figures['hits'] + figures['misses']
+            figures['hit_rate'] = figures['hits'] / lookups if lookups else None
+            memo[name] = figures
+        return {
+            'label': self.label,
+            'wall_time': self.elapsed(),
+            'nodes': self.nodes,
+            'depth_histogram': {str(depth): n for depth, n in sorted(self.depths.items())},
+            'counters': dict(sorted(self.counters.items())),
+            'phases': self.phases,
+            'memo': memo,
+            **self.extra,
+        }
+
+    def emitting(self, target=None):
+        # One line per run: stderr by default, appended to `target` otherwise
+        line = json.dumps(self.record(), default=str)
+        if target in (None, '-'):
+            print(line, file=sys.stderr)
+        else:
+            with open(target, 'a') as sink:
+                sink.write(line + "\n")
+
+def timing(stats, name):
+    # stats.phase(name), or nothing at all when the run keeps no stats
+    return nullcontext() if stats is None else stats.phase(name)
+
+def printing_progress(stats):
+    elapsed = stats.elapsed()
+    rate = stats.nodes / elapsed if elapsed else 0.0
+    deepest = max(stats.depths, default=0)
+    print(f"[{stats.label}] {stats.nodes:,} nodes | {elapsed:.1f}s | {rate:,.0f} nodes/s | "
+          f"deepest {deepest}", file=sys.stderr, flush=True)
+
+def profiled(run, stats=None, top=25):
+    # Runs run() under cProfile and tracemalloc. The hottest functions go to
+    # stderr; the allocation peak goes into the stats record when there is one
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        return run()
+    finally:
+        profiler.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(top)
+        print(report.getvalue(), file=sys.stderr)
+        print(f"tracemalloc peak: {peak / 1024:.0f} KB", file=sys.stderr)
+        if stats is not None:
+            stats.extra['tracemalloc_peak_kb'] = peak // 1024
+
+# Command-line hooks, shared by every script:
+#   --stats [file]     emit the record (stderr, or appended to file)
+#   --progress [n]     progress line on stderr every n nodes
+#   --profile          cProfile + tracemalloc around the run (implies --stats)
+STATS_FLAGS = ('--stats', '--progress', '--profile')
+
+# Value after a --flag, or default when the flag is missing or is followed
+# by another flag; reading_option reads it from sys.argv.
+def flag_value(argv, name, default=None):
+    if name not in argv:
+        return default
+    position = argv.index(name) + 1
+    if position < len(argv) and not argv[position].startswith('--'):
+        return argv[position]
+    return default
+
+def reading_option(name, default=None):
+    return flag_value(sys.argv, name, default)
+
+# The flags among `names` given with no value after them, for a usage error
+def missing_values(names, argv=None):
+    argv = sys.argv if argv is None else argv
+    return [name for name in names if name in argv and flag_value(argv, name) is None]
+
+def stats_from_argv(label, argv=None):
+    argv = sys.argv if argv is None else argv
+    if not any(flag in argv for flag in STATS_FLAGS):
+        return None
+    every = flag_value(argv, '--progress')
+    return Run_Stats(label, printing_progress if '--progress' in argv else None,
+                     int(every) if every else PROGRESS_EVERY)
+
+def running_with_stats(label, main, argv=None):
+    # main(stats) does the run; stats is None when no flag asked for it
+    argv = sys.argv if argv is None else argv
+    stats = stats_from_argv(label, argv)
+    try:
+        if '--profile' in argv:
+            return profiled(lambda: main(stats), stats)
+        return main(stats)
+    finally:
+        if stats is not None:
+            stats.emitting(flag_value(argv, '--stats'))
@@ -0,0 +1,413 @@
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from run_stats import reading_option
+
+# Long-running JSON-lines front end for the four schedulers.
+#
+# One request per line, on stdin or on a local unix socket, and one answer
+# per line in the order the answers are ready (match them by "id"):
+#
+#   {"id": 1, "query": "assg01.count", "file": "input02.txt", "days": 3}
+#   {"id": 1, "ok": true, "result": {"count": 159667200}, "warm": false, "elapsed": 0.41}
+#
+# The instance is a "file" path or the file's "text" inline, and is known by
+# the hash of its content. Queries run in worker processes, and every
+# instance hash always goes to the same worker, which keeps what it built
+# for it (parsed graphs, memo tables, feasibility oracles, days tables, EV
+# answers), so a later what-if query on the same instance starts warm.
+# A worker answers one query at a time; different instances spread over
+# the workers.
+#
+# Timeouts: a query gets "timeout" seconds (per request, --timeout for the
+# default). The searches check the clock through their checkpoint hook and
+# stop cleanly, Z3 gets the deadline itself; a query that overruns anyway
+# (no hook on its path) has its worker killed after BACKSTOP_GRACE more
+# seconds, and that worker starts again cold. A worker that dies by itself
+# fails only the query it was on and is started again the same way.
+
+SERVICE_TIMEOUT = 30.0   # seconds per query unless the request says otherwise
+BACKSTOP_GRACE = 2.0     # seconds past the timeout before the worker is killed
+WARM_INSTANCES = 8       # instances kept per worker
+WARM_PARTS = 8           # memo tables / oracles / days tables kept per instance
+WORKER_MEMO_MB = 16      # cap of each memo table in a worker
+
+class Query_Timeout(Exception):
+    pass
+
+class Worker_Crashed(Exception):
+    pass
+
+class Deadline:
+    # Stands in for a Checkpointer: the searches call due() once per node,
+    # and this one raises once the time is up instead of saving anything.
+    def __init__(self, seconds):
+        self.at = time.monotonic() + seconds
+        self.ticks = 0
+        self.describing = None
+
+    def due(self):
+        self.ticks += 1
+        if not self.ticks & 1023 and time.monotonic() > self.at:
+            raise Query_Timeout()
+        return False
+
+    def checking(self):
+        if time.monotonic() > self.at:
+            raise Query_Timeout()
+
+    def left(self):
+        return max(0.0, self.at - time.monotonic())
+
+# Worker side. Everything below runs in the worker processes; the solver
+# modules are imported once when a worker starts, so no query pays for Z3
+# or NumPy.
+
+_instances = OrderedDict()
+
+def starting_worker():
+    global assg01, assg02, assg03, assg04, days_table, bulk_loader, transposition_table
+    import assg01, assg02, assg03, assg04, days_table, bulk_loader, transposition_table
+
+class Warm_Instance:
+    def __init__(self, digest, path, text):
+        self.digest = digest
+        self.path = path
+        self.text = text
+        self.parsed = {}
+        self.parts = OrderedDict()
+        self.built = 0
+
+    @contextmanager
+    def source(self):
+        # (path, use the loader's on-disk cache): inline text goes through a
+        # scratch file, which must not leave a cache next to it
+        if self.text is None:
+            yield self.path, True
+            return
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as scratch:
+            scratch.write(self.text)
+        try:
+            yield scratch.name, False
+        finally:
+            os.remove(scratch.name)
+
+    def parsing(self, kind, load):
+        if kind not in self.parsed:
+            with self.source() as (path, cached):
+                self.parsed[kind] = load(path, cached)
+            self.built += 1
+        return self.parsed[kind]
+
+    def keeping(self, key, build):
+        if key in self.parts:
+            self.parts.move_to_end(key)
+        else:
+            self.parts[key] = build()
+            self.built += 1
+            if len(self.parts) > WARM_PARTS:
+                self.parts.popitem(last=False)
+        return self.parts[key]
+
+def warm_instance(digest, path, text):
+    instance = _instances.get(digest)
+    if instance is None:
+        instance = _instances[digest] = Warm_Instance(digest, path, text)
+        if len(_instances) > WARM_INSTANCES:
+            _instances.popitem(last=False)
+    else:
+        _instances.move_to_end(digest)
+    return instance
+
+def capped_memo():
+    return transposition_table.Transposition_Table.from_megabytes(WORKER_MEMO_MB)
+
+def task_headers_and_graph(instance):
+    return instance.parsing('tasks', lambda path, cached: bulk_loader.loading_task_graph(path, str, cached))
+
+def assg01_engine(instance, params):
+    headers, graph = task_headers_and_graph(instance)
+    N, K = int(params.get('N', headers['N'])), int(params.get('K', headers['K']))
+    days, relabel = int(params['days']), bool(params.get('relabel', False))
+    # Memo entries only hold for the settings they were counted under
+    memo = instance.keeping(('assg01', N, K, days, relabel), capped_memo)
+    return assg01.Schedule_Optimizer(N, K, days, graph, relabel, memo)
+
+def counting_query(instance, params, deadline):
+    return {'count': assg01_engine(instance, params).counting_completions(deadline)}
+
+def enumerating_query(instance, params, deadline):
+    engine = assg01_engine(instance, params)
+    count = engine.counting_completions(deadline)
+    plans = []
+    for plan in engine.generating_schedules(int(params.get('limit', 5)), int(params.get('skip', 0))):
+        plans.append([list(assignment) for assignment in plan])
+        deadline.checking()
+    return {'count': count, 'plans': plans}
+
+def assg02_oracle(instance):
+    headers, graph = task_headers_and_graph(instance)
+    # One oracle per instance: its answers and dead states serve every N, K
+    oracle = instance.keeping('assg02', lambda: assg02.Feasibility_Oracle(graph, dead_states=capped_memo()))
+    return headers, graph, oracle
+
+def earliest_days_query(instance, params, deadline):
+    headers, graph, oracle = assg02_oracle(instance)
+    N, K = int(params.get('N', headers['N'])), int(params.get('K', headers['K']))
+    oracle.checkpoint = deadline
+    try:
+        return {'days': assg02.earliest_completion(graph, N, K, bool(params.get('nextday', False)), oracle)}
+    finally:
+        oracle.checkpoint = None
+
+def minimum_k_query(instance, params, deadline):
+    headers, graph, oracle = assg02_oracle(instance)
+    N = int(params.get('N', headers['N']))
+    oracle.checkpoint = deadline
+    try:
+        return {'K': assg02.minimum_subscription(graph, N, int(params['deadline']),
+                                                 bool(params.get('nextday', False)), oracle)}
+    finally:
+        oracle.checkpoint = None
+
+def objectives_query(instance, params, deadline):
+    graph = instance.parsing('int tasks',
+                             lambda path, cached: bulk_loader.loading_task_graph(path, int, cached)[1])
+    c1, c2, m = int(params['c1']), int(params['c2']), int(params['m'])
+    cg, gm = int(params['chatgpt']), int(params['gemini'])
+    result = {}
+    for case_type in params.get('cases', 'AB'):
+        if assg03.check_cycle(graph):
+            result[case_type] = {'feasible': False, 'cycle': True}
+            continue
+        days, schedule, _ = assg03.generate_schedule(graph, cg, gm, case_type)
+        answer = {'feasible': days is not None, 'days': days, 'schedule': schedule,
+                  'total_cost': None if days is None else assg03.calculate_total_cost(days, cg, gm, c1, c2)}
+        deadline.checking()
+
+        # Days depend on the limits alone, so the table answers every
+        # (c1, c2, m) asked about this instance and these limits
+        table = instance.keeping(('assg03', case_type, cg, gm),
+                                 lambda: days_table.completion_days_table(graph, cg, gm, case_type))
+        best_cg, best_gm, best_cost = (int(x[0]) for x in days_table.cheapest_for_scenarios(table, c1, c2, m))
+        answer['subscription'] = None if best_cost < 0 else {'chatgpt': best_cg, 'gemini': best_gm,
+                                                             'daily_cost': best_cost}
+        result[case_type] = answer
+    return result
+
+def ev_instance(path, cached):
+    K, P, vehicles = bulk_loader.loading_ev_instance(path, cached)
+    components = assg04.overlap_components(len(vehicles), assg04.overlapping_pairs(vehicles))
+    return K, P, vehicles, components
+
+def optimizing_query(instance, params, deadline):
+    K, P, vehicles, components = instance.parsing('ev', ev_instance)
+    # Every query runs against a deadline, where the one-hot model finds a
+    # first schedule sooner
+    encoding = params.get('encoding', 'onehot')
+    known = instance.parts.get(('assg04', encoding))
+    if known is not None:
+        return known
+    status, chosen, total, lower = assg04.solving_components(K, P, vehicles, components, encoding,
+                                                             deadline=time.time() + deadline.left())
+    answer = {'status': status, 'cost': total, 'lower_bound': lower,
+              'schedule': None if chosen is None else [[v[0], *values] for v, values in zip(vehicles, chosen)]}
+    if status != 'timeout':
+        # Settled answers do not depend on the time given
+        instance.keeping(('assg04', encoding), lambda: answer)
+    return answer
+
+QUERIES = {
+    'assg01.count': counting_query,
+    'assg01.enumerate': enumerating_query,
+    'assg02.earliest_days': earliest_days_query,
+    'assg02.minimum_k': minimum_k_query,
+    'assg03.objectives': objectives_query,
+    'assg04.optimize': optimizing_query,
+}
+
+def answering_query(query, digest, path, text, params, timeout):
+    instance = warm_instance(digest, path, text)
+    instance.built = 0
+    result = QUERIES[query](instance, params, Deadline(timeout))
+    return result, instance.built == 0
+
+# Service side: the event loop, one single-process pool per worker and the
+# routing of instance hashes to workers.
+
+class Worker_Shard:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pool = None
+        self.pid = None
+
+    async def running(self, job, timeout):
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            try:
+                if self.pool is None:
+                    self.pool = ProcessPoolExecutor(1, initializer=starting_worker)
+                    self.pid = await loop.run_in_executor(self.pool, os.getpid)
+                return await asyncio.wait_for(loop.run_in_executor(self.pool, answering_query, *job, timeout),
+                                              timeout + BACKSTOP_GRACE)
+            except asyncio.TimeoutError:
+                self.stopping(kill=True)
+                raise Query_Timeout()
+            except BrokenProcessPool:
+                self.stopping(kill=True)
+                raise Worker_Crashed()
+
+    def stopping(self, kill=False):
+        if self.pool is None:
+            return
+        if kill:
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.pool.shutdown(wait=not kill, cancel_futures=True)
+        self.pool = None
+
+class Stdin_Lines:
+    # readline() for the event loop that works whatever stdin is (pipe,
+    # terminal or redirected file). Lines are read with os.read on a daemon
+    # thread: a thread parked in sys.stdin holds its lock, which a freshly
+    # forked worker (closing its stdin) and the interpreter shutdown would
+    # both wait on for good
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.lines = asyncio.Queue()
+        threading.Thread(target=self.reading, daemon=True).start()
+
+    def reading(self):
+        rest = b''
+        while True:
+            chunk = os.read(sys.stdin.fileno(), 1 << 16)
+            if chunk:
+                *lines, rest = (rest + chunk).split(b'\n')
+                lines = [line + b'\n' for line in lines]
+            else:
+                lines = [rest, b''] if rest else [b'']
+            for line in lines:
+                try:
+                    self.loop.call_soon_threadsafe(self.lines.put_nowait, line)
+                except RuntimeError:  # the loop is closed
+                    return
+            if not chunk:
+                return
+
+    async def readline(self):
+        return await self.lines.get()
+
+class Solver_Service:
+    def __init__(self, workers=1, timeout=SERVICE_TIMEOUT):
+        self.shards = [Worker_Shard() for _ in range(workers)]
+        self.timeout = timeout
+        self.digests = {}  # path -> (mtime, size, digest), so unchanged files are not re-read
+
+    def locating(self, request):
+        if 'text' in request:
+            return hashlib.sha256(request['text'].encode()).hexdigest(), None, request['text']
+        path = os.path.abspath(request['file'])
+        status = os.stat(path)
+        known = self.digests.get(path)
+        if known is None or known[:2] != (status.st_mtime_ns, status.st_size):
+            with open(path, 'rb') as f:
+                known = (status.st_mtime_ns, status.st_size, hashlib.sha256(f.read()).hexdigest())
+            self.digests[path] = known
+        return known[2], path, None
+
+    async def answering(self, line):
+        started = time.perf_counter()
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            query = request.get('query')
+            if query not in QUERIES:
+                raise ValueError(f"unknown query: {query} (expected one of {', '.join(QUERIES)})")
+            if 'file' not in request and 'text' not in request:
+                raise ValueError("the request needs a file or a text")
+            digest, path, text = self.locating(request)
+            params = {k: v for k, v in request.items() if k not in ('id', 'query', 'file', 'text', 'timeout')}
+            timeout = float(request.get('timeout', self.timeout))
+            shard = self.shards[int(digest[:8], 16) % len(self.shards)]
+            result, warm = await shard.running((query, digest, path, text, params), timeout)
+            response = {'id': request_id, 'ok': True, 'result': result, 'warm': warm}
+        except Query_Timeout:
+            response = {'id': request_id, 'ok': False, 'error': 'timeout'}
+        except Worker_Crashed:
+            response = {'id': request_id, 'ok': False, 'error': 'worker crashed'}
+        except KeyError as e:
+            response = {'id': request_id, 'ok': False, 'error': f"missing field: {e.args[0]}"}
+        except Exception as e:
+            response = {'id': request_id, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        response['elapsed'] = round(time.perf_counter() - started, 6)
+        return json.dumps(response, default=int) + "\n"
+
+    async def serving(self, reader, write):
+        # Every line is answered as soon as it is ready; the stream closing
+        # waits for the answers still in flight
+        pending = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.create_task(self.answering(line))
+            pending.add(task)
+            task.add_done_callback(lambda done: (pending.discard(done), write(done.result())))
+        if pending:
+            await asyncio.wait(pending)
+
+    async def serving_stdin(self):
+        def write(text):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        await self.serving(Stdin_Lines(), write)
+
+    async def serving_socket(self, path):
+        async def connection(reader, writer):
+            try:
+                await self.serving(reader, lambda text: writer.write(text.encode()))
+                await writer.drain()
+            finally:
+                writer.close()
+        if os.path.exists(path):
+            os.remove(path)
+        server = await asyncio.start_unix_server(connection, path, limit=1 << 26)
+        print(f"Listening on {path}", file=sys.stderr, flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            os.remove(path)
+
+    def stopping(self):
+        for shard in self.shards:
+            shard.stopping()
+
+if __name__ == "__main__":
+    # python solver_service.py [--socket path] [--workers n] [--timeout seconds]
+    service = Solver_Service(int(reading_option('--workers', os.cpu_count() or 1)),
+                             float(reading_option('--timeout', SERVICE_TIMEOUT)))
+    socket_path = reading_option('--socket')
+    # Stop like Ctrl-C, so the workers are shut down with the service
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        asyncio.run(service.serving_stdin() if socket_path is None else service.serving_socket(socket_path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stopping()
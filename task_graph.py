@@ -0,0 +1,186 @@
+import heapq
+from array import array
+
+class Task_Graph:
+    # Compact dependency graph shared by the schedulers.
+    #
+    # Tasks get dense ids 0..T-1 in label order (labels compare as whatever
+    # type they were read as, so string labels sort as strings). Successor
+    # and predecessor lists are CSR arrays: the successors of task i are
+    # succ_ids[succ_start[i]:succ_start[i + 1]], likewise for predecessors.
+    # A dependency on a label that is not in the file is kept only as a
+    # count in missing[i]; such a task can never become ready.
+    #
+    # One Kahn pass at construction gives:
+    #   order  - tasks that can ever run, lowest ready id first
+    #   levels - tasks on the longest chain ending at i (0 if i never runs)
+    #   tails  - tasks on the longest chain starting at i, itself included
+    __slots__ = ('labels', 'index_of', 'costs', 'succ_start', 'succ_ids', 'pred_start', 'pred_ids',
+                 'missing', 'waiting', 'order', 'levels', 'tails')
+
+    def __init__(self, entries):
+        # entries: (label, cost, dependency labels); a repeated label keeps
+        # its last line, repeated dependencies count once.
+        table = {}
+        for label, cost, dependencies in entries:
+            table[label] = (cost, dependencies)
+        self.labels = sorted(table)
+        self.index_of = {label: i for i, label in enumerate(self.labels)}
+        T = len(self.labels)
+
+        self.costs = array('q', (table[label][0] for label in self.labels))
+        missing = [0] * T
+        pred_start = [0]
+        pred_ids = []
+        succ_count = [0] * T
+        index_of = self.index_of
+        for i, label in enumerate(self.labels):
+            for dep in dict.fromkeys(table[label][1]):
+                j = index_of.get(dep)
+                if j is None:
+                    missing[i] += 1
+                else:
+                    pred_ids.append(j)
+                    succ_count[j] += 1
+            pred_start.append(len(pred_ids))
+
+        succ_start = [0]
+        for count in succ_count:
+            succ_start.append(succ_start[-1] + count)
+        succ_ids = [0] * len(pred_ids)
+        fill = succ_start[:T]
+        for i in range(T):
+            for k in range(pred_start[i], pred_start[i + 1]):
+                j = pred_ids[k]
+                succ_ids[fill[j]] = i
+                fill[j] += 1
+
+        self.filling(missing, pred_start, pred_ids, succ_start, succ_ids)
+
+    @classmethod
+    def from_csr(cls, labels, costs, missing, pred_start, pred_ids, succ_start, succ_ids,
+                 order=None, levels=None, tails=None):
+        # Builds the graph from ready-made CSR lists (labels already sorted,
+        # everything in dense-id order). order/levels/tails skip the Kahn
+        # pass when they come from an earlier build of the same graph.
+        graph = cls.__new__(cls)
+        graph.labels = labels
+        graph.index_of = {label: i for i, label in enumerate(labels)}
+        graph.costs = array('q', costs)
+        graph.filling(missing, pred_start, pred_ids, succ_start, succ_ids, order, levels, tails)
+        return graph
+
+    def filling(self, missing, pred_start, pred_ids, succ_start, succ_ids, order=None, levels=None, tails=None):
+        T = len(self.labels)
+        self.missing = array('l', missing)
+        self.pred_start = array('l', pred_start)
+        self.pred_ids = array('l', pred_ids)
+        self.succ_start = array('l', succ_start)
+        self.succ_ids = array('l', succ_ids)
+        self.waiting = array('l', (self.pred_start[i + 1] - self.pred_start[i] + self.missing[i]
+                                   for i in range(T)))
+        if order is None:
+            self.kahn_pass(succ_start, succ_ids, pred_start, pred_ids, self.waiting)
+        else:
+            self.order = array('l', order)
+            self.levels = array('l', levels)
+            self.tails = array('l', tails)
+
+    def kahn_pass(self, succ_start, succ_ids, pred_start, pred_ids, waiting):
+        T = len(self.labels)
+        waiting = list(waiting)
+        heap = [i for i in range(T) if waiting[i] == 0]
+        heapq.heapify(heap)
+        order = []
+        levels = [0] * T
+        for i in heap:
+            levels[i] = 1
+        while heap:
+            t = heapq.heappop(heap)
+            order.append(t)
+            level = levels[t] + 1
+            for k in range(succ_start[t], succ_start[t + 1]):
+                succ = succ_ids[k]
+                if levels[succ] < level:
+                    levels[succ] = level
+                waiting[succ] -= 1
+                if waiting[succ] == 0:
+                    heapq.heappush(heap, succ)
+
+        # Tails come from a sinks-first pass over the in-file edges, so they
+        # are defined for tasks blocked by a missing dependency as well.
+        tails = [1] * T
+        left = [succ_start[i + 1] - succ_start[i] for i in range(T)]
+        stack = [i for i in range(T) if left[i] == 0]
+        while stack:
+            t = stack.pop()
+            tail = tails[t] + 1
+            for k in range(pred_start[t], pred_start[t + 1]):
+                pred = pred_ids[k]
+                if tails[pred] < tail:
+                    tails[pred] = tail
+                left[pred] -= 1
+                if left[pred] == 0:
+                    stack.append(pred)
+
+        self.order = array('l', order)
+        self.levels = array('l', levels)
+        self.tails = array('l', tails)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def successors(self, i):
+        return self.succ_ids[self.succ_start[i]:self.succ_start[i + 1]]
+
+    def predecessors(self, i):
+        return self.pred_ids[self.pred_start[i]:self.pred_start[i + 1]]
+
+    def predecessor_masks(self):
+        # Bitmask form for the searches over done-sets: one mask of direct
+        # dependencies per task, and the mask of tasks that wait on a
+        # dependency outside the file and so can never run.
+        masks = []
+        blocked = 0
+        for i in range(len(self.labels)):
+            mask = 0
+            for p in self.predecessors(i):
+                mask |= 1 << p
+            if self.missing[i]:
+                blocked |= 1 << i
+            masks.append(mask)
+        return masks, blocked
+
+    def waiting_counts(self):
+        # Fresh copy of the not-yet-done dependency counts, missing ones included.
+        return array('l', self.waiting)
+
+    @property
+    def complete(self):
+        # Every task can run: no cycle and no dependency outside the file.
+        return len(self.order) == len(self.labels)
+
+    def longest_chain(self):
+        # Tasks on the longest dependency chain, or None when some task can
+        # never become ready.
+        if not self.complete:
+            return None
+        return max(self.levels, default=0)
+
+def reading_task_file(filename, label_type=str):
+    # Reads the shared instance format: '%' comments, one-letter headers
+    # such as 'N 2' / 'K 5', and task lines 'A <id> <cost> <deps...> 0'.
+    # Returns (headers, graph); headers maps each letter to its integer.
+    headers = {}
+    entries = []
+    with open(filename, 'r', encoding='utf-8-sig') as source:
+        for line in source:
+            bits = line.strip().split()
+            if not bits or bits[0].startswith('%'):
+                continue
+            if bits[0] == 'A':
+                deps = [label_type(d) for d in bits[3:] if d != '0']
+                entries.append((label_type(bits[1]), int(bits[2]), deps))
+            elif len(bits) == 2 and len(bits[0]) == 1:
+                headers[bits[0]] = int(bits[1])
+    return headers, Task_Graph(entries)
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+
+# Bytes per stored entry, used to turn a megabyte cap into a count. Measured
+# as process RSS growth over a full table of assg01 state keys holding
+# 40-bit counts, including the OrderedDict resize peak and
+# allocator slack, so a --memo-mb cap is approximate but errs on the low side.
+LRU_ENTRY_BYTES = 460
+SLOT_ENTRY_BYTES = 280
+
+class Transposition_Table:
+    # Memo for the backtracking searches with an optional size cap.
+    #
+    # The full state key is stored and compared on every lookup. hash() is
+    # not a safe fingerprint on its own: ints hash modulo 2**61 - 1, so
+    # states whose keys differ by a multiple of that would share an entry.
+    #
+    # policy 'lru'   - evict the least recently used entry when full
+    # policy 'depth' - fixed slot array indexed by hash(key); a colliding
+    #                  store only replaces an entry that covered a subtree no
+    #                  deeper than its own, so expensive results are kept
+    def __init__(self, max_entries=None, policy='lru'):
+        if policy not in ('lru', 'depth'):
+            raise ValueError(f"unknown replacement policy: {policy}")
+        if policy == 'depth' and not max_entries:
+            raise ValueError("the depth policy needs max_entries")
+        self.max_entries = max_entries
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        if policy == 'lru':
+            self.entries = OrderedDict()
+        else:
+            self.slots = [None] * max_entries
+            self.filled = 0
+
+    @classmethod
+    def from_megabytes(cls, megabytes, policy='lru'):
+        per_entry = LRU_ENTRY_BYTES if policy == 'lru' else SLOT_ENTRY_BYTES
+        return cls(max(1, int(megabytes * 1_000_000 // per_entry)), policy)
+
+    def get(self, key, default=None):
+        if self.policy == 'lru':
+            value = self.entries.get(key, self)
+            if value is self:
+                self.misses += 1
+                return default
+            if self.max_entries:
+                self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        slot = self.slots[hash(key) % self.max_entries]
+        if slot is not None and slot[0] == key:
+            self.hits += 1
+            return slot[1]
+        self.misses += 1
+        return default
+
+    def put(self, key, value, depth=0):
+        self.stores += 1
+        if self.policy == 'lru':
+            self.entries[key] = value
+            if self.max_entries:
+                self.entries.move_to_end(key)
+                if len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+            return
+
+        index = hash(key) % self.max_entries
+        slot = self.slots[index]
+        if slot is None:
+            self.filled += 1
+        elif slot[0] != key:
+            if slot[2] > depth:
+                self.evictions += 1
+                return
+            self.evictions += 1
+        self.slots[index] = (key, value, depth)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def add(self, key, depth=0):
+        self.put(key, True, depth)
+
+    def __len__(self):
+        return len(self.entries) if self.policy == 'lru' else self.filled
+
+    def snapshot(self):
+        # Plain data for a checkpoint. The keys themselves are saved, so it
+        # holds in any process, whatever hash() gives there.
+        stored = list(self.entries.items()) if self.policy == 'lru' else [slot for slot in self.slots if slot]
+        return {"policy": self.policy, "capacity": self.max_entries, "stored": stored,
+                "counters": (self.hits, self.misses, self.stores, self.evictions)}
+
+    def restoring(self, snapshot):
+        if (snapshot["policy"], snapshot["capacity"]) != (self.policy, self.max_entries):
+            raise ValueError("the saved memo table was built with other settings")
+        if self.policy == 'lru':
+            self.entries = OrderedDict(snapshot["stored"])
+        else:
+            # hash() of str and bytes is salted per process, so the slots
+            # are worked out again here
+            self.slots = [None] * self.max_entries
+            self.filled = 0
+            for key, value, depth in snapshot["stored"]:
+                self.put(key, value, depth)
+        self.hits, self.misses, self.stores, self.evictions = snapshot["counters"]
+
+    def stats(self):
+        return {
+            "policy": self.policy,
+            "capacity": self.max_entries,
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }